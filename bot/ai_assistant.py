@@ -1,17 +1,25 @@
 """
 Asistente de IA para análisis de proyectos y generación de propuestas.
 
-Este módulo maneja toda la interacción con la API de Gemini/OpenAI para:
+Este módulo maneja toda la interacción con los proveedores de IA para:
 - Analizar proyectos y determinar si son viables
 - Generar propuestas personalizadas
 - Calcular precios y tiempos de entrega agresivos pero realistas
+
+Los backends (OpenAI, Gemini, local, stub) viven en ai_providers.py.
 """
 
 import time
-import json
-import re
-import google.generativeai as genai
-from openai import OpenAI
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .config import Config
+from .logger import logger
+from .prompts import build_analysis_prompt, build_scoring_prompt
+from .ai_client import AIBudget, AIBudgetExceeded, SharedBudget
+from .ai_providers import create_provider
+from . import ai_schema
+from .ai_schema import ANALYSIS_SCHEMA, SCORING_SCHEMA
 
 
 class AIAssistant:
@@ -21,35 +29,49 @@ class AIAssistant:
     La IA sabe que eres un programador experto que usa las últimas IAs
     para generar código, permitiendo precios y tiempos agresivos.
     
-    Soporta Gemini y OpenAI.
+    Soporta cualquier proveedor registrado (gemini, openai, local, stub),
+    opcionalmente con un proveedor distinto para la fase de scoring.
     """
     
-    def __init__(self, provider="openai", gemini_key=None, openai_key=None):
+    def __init__(self, provider=None, scoring_provider=None):
         """
         Inicializa el asistente de IA.
         
         Args:
-            provider: "gemini" u "openai"
-            gemini_key: Clave de API de Gemini (si provider=gemini)
-            openai_key: Clave de API de OpenAI (si provider=openai)
+            provider: Proveedor para redactar propuestas (por defecto Config.AI_PROVIDER)
+            scoring_provider: Proveedor para la fase de scoring
+                (por defecto Config.AI_SCORING_PROVIDER; si es el mismo, se hace una sola llamada)
             
         Raises:
-            ValueError: Si falta la API key correspondiente
-        """
-        self.provider = provider.lower()
-        
-        if self.provider == "gemini":
-            if not gemini_key:
-                raise ValueError("❌ FALTA GEMINI_KEY")
-            genai.configure(api_key=gemini_key)
-            print(f"🤖 IA configurada: Gemini")
-        elif self.provider == "openai":
-            if not openai_key:
-                raise ValueError("❌ FALTA OPENAI_API_KEY")
-            self.client = OpenAI(api_key=openai_key)
-            print(f"🤖 IA configurada: OpenAI (GPT-4o-mini)")
-        else:
-            raise ValueError(f"❌ Proveedor desconocido: {provider}")
+            ValueError: Si el proveedor no existe o falta su API key
+        """
+        provider = (provider or Config.AI_PROVIDER).lower()
+        scoring_provider = (scoring_provider or Config.AI_SCORING_PROVIDER or provider).lower()
+        
+        self.provider = create_provider(provider)
+        self.scoring_provider = create_provider(scoring_provider) if scoring_provider != provider else None
+        self.budget = None
+        
+        # Hedging: si el proveedor principal tarda más que su p90, se pregunta también al secundario
+        hedge_provider = Config.AI_HEDGE_PROVIDER
+        self.hedge_provider = create_provider(hedge_provider) if hedge_provider and hedge_provider != provider else None
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ai-hedge") if self.hedge_provider else None
+        self.latencies = deque(maxlen=50)  # Latencias observadas del proveedor principal
+        self.hedge_stats = {"calls": 0, "fired": 0, "secondary_wins": 0, "saved_seconds": 0.0}
+
+    def start_run(self, seconds=None):
+        """
+        Inicia el presupuesto de tiempo de IA y los contadores de JSON de una ejecución.
+        
+        Args:
+            seconds: Segundos totales de IA (por defecto Config.AI_RUN_BUDGET_SECONDS)
+        """
+        self.budget = AIBudget(seconds or Config.AI_RUN_BUDGET_SECONDS)
+        ai_schema.reset_stats()
+
+    def budget_exhausted(self):
+        """True si se agotó el tiempo de IA de la ejecución actual."""
+        return self.budget is not None and self.budget.exhausted()
 
     def analyze_project(self, project_data):
         """
@@ -62,11 +84,11 @@ class AIAssistant:
         - Regla: "Factura ahora, aprende después"
         
         Args:
-            project_data: Diccionario con datos del proyecto:
+            project_data: Project con los datos del proyecto:
                 - title: Título del proyecto
                 - description: Descripción completa
                 - budget_text: Presupuesto del cliente
-                - bids_count: Número de propuestas existentes
+                - bids: Número de propuestas existentes
                 
         Returns:
             Dict con:
@@ -78,111 +100,200 @@ class AIAssistant:
                 - suggested_price: int (precio sugerido por la IA)
             None si hay error
         """
-        prompt = f"""
-        ACTÚA COMO: Un Ingeniero de Software Senior con 10 años de experiencia.
-        TONO: Seco, directo, profesional. CERO entusiasmo artificial.
-        OBJETIVO: Identificar si es un proyecto automatizable y ganar la oferta.
-
-        CONTEXTO CRÍTICO (NO MENCIONAR AL CLIENTE):
-        - Eres experto en TODO, especialmente en este trabajo específico.
-        - Usas las últimas IAs de generación de código (Claude, GPT-4, Cursor, etc.) que son una locura.
-        - Esto te permite ser MUY rápido y eficiente.
-        - REGLA: "Factura ahora, aprende después" - Acepta proyectos que puedas resolver con IA.
-        - Debes ser AGRESIVO en precio y tiempo, pero realista (no imposible).
-
-        DATOS DEL PROYECTO:
-        Título: {project_data['title']}
-        Descripción: {project_data['description']}
-        Presupuesto Cliente: {project_data['budget_text']}
-        Competencia: {project_data['bids_count']} propuestas.
-
-        INSTRUCCIONES CRÍTICAS (ANTI-BOT):
-        1. **DETECTOR DE TRAMPAS:** Busca en la descripción si el cliente pide escribir una palabra específica al inicio (ej: "Escribe 'hola' al empezar"). Si existe, LA PRIMERA PALABRA DE TU PROPUESTA DEBE SER ESA.
-        2. **PERSONALIZACIÓN:** Menciona un detalle técnico específico de la descripción para demostrar que leíste.
-        3. **SCORE DE VIABILIDAD (0-100):** 
-           - 80-100: Tareas de automatización, scripts, scraping, webs simples (Dinero fácil con IA).
-           - 0-40: Tareas creativas subjetivas, hardware, o descripciones sin sentido.
-
-        ESTRATEGIA DE VENTA (CAMALEÓN):
-        - **JAMÁS menciones IA.** Tu rapidez es por "módulos propios", "experiencia" o "metodología optimizada".
-        - Si hay mucha competencia (>20), sé más agresivo en el precio/tiempo.
-        - Si hay pocas propuestas (<5), puedes ser más agresivo porque hay menos competencia.
-        
-        PRECIO Y TIEMPO (AGRESIVOS PERO REALISTAS):
-        - Considera que puedes usar IAs para acelerar el desarrollo.
-        - El precio debe ser competitivo pero no regalado (30-50% del presupuesto del cliente si hay pocas propuestas).
-        - El tiempo debe ser 2-3x más rápido que un desarrollador tradicional (pero no imposible).
-        - Ejemplo: Si un proyecto normalmente toma 7 días, ofrécelo en 2-3 días.
-        - Ejemplo: Si el presupuesto es $1000, ofrécelo en $400-600 si hay pocas propuestas.
-        
-        REDACCIÓN (HUMANA):
-        - PROHIBIDO usar: "Hola", "Espero que estés bien", "Estoy emocionado", "¡!".
-        - Estilo Senior: "Leí tu requerimiento sobre [X]. Puedo resolverlo implementando [Y]."
-        - Cierre: "¿Tienes la documentación lista?" o similar.
-
-        OUTPUT JSON:
-        {{
-            "is_relevant": true,
-            "score": (0-100),
-            "reason": "...",
-            "delivery_days": (entero, tiempo agresivo pero realista),
-            "proposal_text": "Texto plano...",
-            "suggested_price": (entero, precio agresivo pero competitivo)
-        }}
-        """
-        
-        # Lista de modelos a probar (de más rápido a más potente)
-        if self.provider == "gemini":
-            modelos = [
-                'models/gemini-2.5-flash-lite',
-                'models/gemini-2.0-flash-lite', 
-                'models/gemini-2.5-flash',
-                'models/gemini-2.0-flash',
-                'models/gemini-flash-latest',
-                'models/gemini-2.5-pro'
-            ]
+        try:
+            # Fase 1 (opcional): scoring con el proveedor barato
+            if self.scoring_provider:
+                prompt, prompt_info = build_scoring_prompt(project_data)
+                scoring = self.complete_json(self.scoring_provider, prompt, SCORING_SCHEMA)
+                if not scoring:
+                    return None
+                if scoring.get('score', 0) < Config.MIN_SCORE_TO_BID:
+                    return scoring
+                logger.info(f"      🧮 Scoring {self.scoring_provider.name}: {scoring.get('score')} → redactando con {self.provider.name}")
             
-            for m in modelos:
-                try:
-                    model = genai.GenerativeModel(m)
-                    time.sleep(1)  # Rate limiting
-                    res = model.generate_content(prompt)
-                    if not res.text:
-                        continue
-                    # Limpiar formato JSON
-                    text = re.sub(r'```json|```', '', res.text.strip())
-                    return json.loads(text)
-                except Exception as e:
-                    error_msg = str(e)
-                    # Mostrar solo el primer error con detalle para debug
-                    if m == modelos[0]:
-                        print(f"      ⚠️ Error con {m}: {error_msg[:200]}")
-                    continue
-            
-            print("      ❌ Error: La IA no pudo generar respuesta. Verifica GEMINI_KEY en .env")
+            # Fase 2: análisis completo + propuesta
+            prompt, prompt_info = build_analysis_prompt(project_data)
+            if prompt_info['truncated']:
+                logger.info(f"      ✂️ Descripción recortada a {Config.AI_DESCRIPTION_MAX_TOKENS} tokens")
+            if self.hedge_provider:
+                return self.complete_hedged(prompt)
+            return self.complete_json(self.provider, prompt)
+        except AIBudgetExceeded:
+            logger.warning("      ⏸️ Presupuesto de IA de la ejecución agotado.")
             return None
-            
-        elif self.provider == "openai":
-            # OpenAI: usar GPT-4o-mini (rápido y barato)
+
+    @staticmethod
+    def parse_json(text, schema=ANALYSIS_SCHEMA, label="IA"):
+        """
+        Parsea la respuesta, repara defectos comunes y la valida contra el esquema.
+        
+        Returns:
+            Dict validado o None
+        """
+        data, repairs, errors = ai_schema.parse_response(text, schema)
+        if data is None:
+            logger.warning(f"      ⚠️ Respuesta de {label} inválida: {', '.join(errors)}")
+        elif any(kind != "fence" for kind in repairs):
+            logger.info(f"      🩹 JSON de {label} reparado localmente ({', '.join(repairs)})")
+        return data
+
+    def hedge_delay(self):
+        """
+        Segundos a esperar al proveedor principal antes de disparar el hedge.
+        
+        Usa el p90 de las latencias observadas (con 10+ muestras); si no,
+        Config.AI_HEDGE_AFTER_SECONDS.
+        """
+        if len(self.latencies) < 10:
+            return Config.AI_HEDGE_AFTER_SECONDS
+        ordered = sorted(self.latencies)
+        return ordered[int(0.9 * (len(ordered) - 1))]
+
+    def timed_request(self, provider, prompt, budget):
+        """
+        Una petición (sin reintento por JSON) medida en el tiempo.
+        
+        Returns:
+            Tupla (dict o None, segundos)
+        """
+        started = time.monotonic()
+        try:
+            text = provider.complete(prompt, budget)
+        except AIBudgetExceeded:
+            raise
+        except Exception as e:
+            print(f"      ⚠️ Error con {provider.name}: {str(e)[:200]}")
+            text = None
+        return self.parse_json(text, label=provider.name), time.monotonic() - started
+
+    def complete_hedged(self, prompt):
+        """
+        Pide la respuesta al proveedor principal y, si supera el p90, también al secundario.
+        
+        Gana el primer JSON válido. La petición perdedora se cancela si aún
+        no empezó; si ya está en vuelo se abandona (su timeout la acota).
+        
+        Returns:
+            Dict o None
+        """
+        self.hedge_stats["calls"] += 1
+        started = time.monotonic()
+        # Las peticiones en paralelo no descuentan: se carga el tiempo de reloj del grupo
+        budget = SharedBudget(self.budget) if self.budget is not None else None
+        primary = self.executor.submit(self.timed_request, self.provider, prompt, budget)
+        primary.add_done_callback(self.record_primary_latency)
+        
+        delay = self.hedge_delay()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            self.charge_budget(started)
+            result, _ = primary.result()
+            if result:
+                return result
+            # El principal falló rápido: ir directo al secundario
+            return self.complete_json(self.hedge_provider, prompt)
+        
+        self.hedge_stats["fired"] += 1
+        logger.info(f"      🏁 Hedging: {self.provider.name} lleva {delay:.1f}s, preguntando también a {self.hedge_provider.name}")
+        secondary = self.executor.submit(self.timed_request, self.hedge_provider, prompt, budget)
+        
+        pending = {primary, secondary}
+        budget_error = None
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result, _ = future.result()
+                    except AIBudgetExceeded as e:
+                        budget_error = e
+                        continue
+                    if not result:
+                        continue
+                    for other in pending:
+                        other.cancel()
+                    if future is secondary:
+                        self.record_hedge_win(primary, started)
+                    return result
+        finally:
+            self.charge_budget(started)
+        
+        if budget_error:
+            raise budget_error
+        return None
+
+    def charge_budget(self, started):
+        """Descuenta del presupuesto el tiempo de reloj desde started."""
+        if self.budget is not None:
+            self.budget.charge(time.monotonic() - started)
+
+    def record_hedge_win(self, primary, started):
+        """Cuenta una victoria del secundario; el ahorro se suma cuando el principal termina."""
+        self.hedge_stats["secondary_wins"] += 1
+        won_at = time.monotonic()
+        logger.info(f"      🏁 Ganó {self.hedge_provider.name} en {won_at - started:.1f}s")
+        
+        def add_saved_time(_future):
+            self.hedge_stats["saved_seconds"] += time.monotonic() - won_at
+        
+        primary.add_done_callback(add_saved_time)
+
+    def record_primary_latency(self, future):
+        """
+        Callback: guarda la latencia del proveedor principal (aunque se haya abandonado).
+        
+        Solo las respuestas válidas: los errores rápidos bajarían el p90 y el
+        hedging se dispararía cada vez más seguido.
+        """
+        if not future.cancelled() and future.exception() is None:
+            result, seconds = future.result()
+            if result is not None:
+                self.latencies.append(seconds)
+
+    def log_hedge_stats(self):
+        """Loguea cuántas veces se disparó el hedging y cuánto tiempo ahorró."""
+        if not self.hedge_provider or not self.hedge_stats["calls"]:
+            return
+        stats = self.hedge_stats
+        logger.info(
+            f"🏁 Hedging: disparado {stats['fired']}/{stats['calls']} llamadas | "
+            f"{self.hedge_provider.name} ganó {stats['secondary_wins']} | "
+            f"ahorro ~{stats['saved_seconds']:.0f}s | umbral actual {self.hedge_delay():.1f}s"
+        )
+
+    def log_json_stats(self):
+        """Loguea las reparaciones locales de JSON y las re-consultas evitadas."""
+        stats = ai_schema.stats
+        if not stats["responses"]:
+            return
+        logger.info(
+            f"🩹 JSON de la IA: {stats['responses']} respuestas | {stats['repairs']} reparaciones locales | "
+            f"{stats['requeries_avoided']} re-consultas evitadas | {stats['requeries']} re-consultas | "
+            f"{stats['invalid']} inválidas"
+        )
+
+    def complete_json(self, provider, prompt, schema=ANALYSIS_SCHEMA):
+        """
+        Pide una respuesta al proveedor y la parsea como JSON.
+        
+        Solo se vuelve a consultar si la respuesta no se pudo reparar localmente.
+        
+        Returns:
+            Dict validado o None si el proveedor no devolvió JSON válido
+        """
+        for attempt in range(provider.json_attempts):
+            if attempt:
+                ai_schema.record_requery()
             try:
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "Eres un asistente que analiza proyectos freelance y devuelve SOLO JSON válido."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    response_format={"type": "json_object"}
-                )
-                
-                text = response.choices[0].message.content
-                # Limpiar formato JSON si es necesario
-                text = re.sub(r'```json|```', '', text.strip())
-                return json.loads(text)
-                
+                text = provider.complete(prompt, self.budget, attempt)
+            except AIBudgetExceeded:
+                raise
             except Exception as e:
-                error_msg = str(e)
-                print(f"      ⚠️ Error con OpenAI: {error_msg[:200]}")
-                print("      ❌ Error: La IA no pudo generar respuesta. Verifica OPENAI_API_KEY en .env")
-                return None
-
+                print(f"      ⚠️ Error con {provider.name}: {str(e)[:200]}")
+                break
+            data = self.parse_json(text, schema, provider.name)
+            if data:
+                return data
+        
+        print(f"      ❌ Error: La IA ({provider.name}) no pudo generar respuesta. Verifica la API key en .env")
+        return None
@@ -0,0 +1,174 @@
+"""
+Capa común de llamadas a la IA.
+
+- Clientes HTTP compartidos con conexiones keep-alive (reutilizados entre runs)
+- Timeout por request
+- Reintentos con backoff exponencial con jitter ante rate-limit y errores 5xx
+- Presupuesto total de tiempo de IA por ejecución
+"""
+
+import time
+import random
+import threading
+import httpx
+from openai import OpenAI
+
+from . import metrics
+from .config import Config
+from .logger import logger
+
+
+# Códigos HTTP que vale la pena reintentar
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Errores de red / cuota de los SDKs de OpenAI y Google (por nombre de clase,
+# para no depender de que ambos SDKs estén instalados)
+RETRYABLE_ERRORS = {
+    "APITimeoutError", "APIConnectionError", "RateLimitError", "InternalServerError",
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests",
+    "TimeoutException", "ConnectError", "ReadTimeout", "RemoteProtocolError",
+}
+
+_openai_clients = {}
+
+
+class AIBudgetExceeded(Exception):
+    """Se agotó el tiempo de IA disponible para esta ejecución."""
+
+
+class AIBudget:
+    """
+    Tiempo total de IA disponible en una ejecución.
+
+    Solo se descuenta el tiempo pasado dentro de call_with_retry (llamadas al
+    proveedor y esperas de backoff); escribir propuestas y las pausas entre
+    envíos no gastan presupuesto.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.used = 0.0
+        self.lock = threading.Lock()  # Las llamadas con hedging corren en hilos
+
+    def charge(self, seconds):
+        with self.lock:
+            self.used += seconds
+
+    def remaining(self):
+        return max(0.0, self.seconds - self.used)
+
+    def exhausted(self):
+        return self.remaining() <= 0
+
+
+class SharedBudget:
+    """
+    Vista de un AIBudget para peticiones en paralelo (hedging).
+
+    Consulta el restante pero no descuenta: el llamador carga una sola vez
+    el tiempo de reloj de todo el grupo, así dos peticiones en vuelo al mismo
+    tiempo no gastan el doble.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+
+    def charge(self, seconds):
+        pass
+
+    def remaining(self):
+        return self.budget.remaining()
+
+    def exhausted(self):
+        return self.budget.exhausted()
+
+
+def get_openai_client(api_key, base_url=None):
+    """
+    Devuelve un cliente OpenAI compartido (uno por api_key/base_url).
+
+    El cliente usa un httpx.Client con keep-alive, así el scheduler reutiliza
+    la conexión TLS entre propuestas y entre ejecuciones. Los reintentos del
+    SDK se desactivan: los maneja call_with_retry.
+    """
+    key = (api_key, base_url)
+    if key not in _openai_clients:
+        http_client = httpx.Client(
+            timeout=Config.AI_REQUEST_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300)
+        )
+        _openai_clients[key] = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=0
+        )
+    return _openai_clients[key]
+
+
+def is_retryable(error):
+    """True si el error es transitorio (rate-limit, 5xx, timeout, red)."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None:
+        code = getattr(error, 'code', None)
+        status = code if isinstance(code, int) else None
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS or status >= 500
+    return type(error).__name__ in RETRYABLE_ERRORS
+
+
+def backoff_delay(attempt):
+    """Backoff exponencial con jitter completo: uniforme en [0, base * 2^intento]."""
+    return random.uniform(0, min(Config.AI_BACKOFF_MAX, Config.AI_BACKOFF_BASE * (2 ** attempt)))
+
+
+def call_with_retry(fn, budget=None, label="IA"):
+    """
+    Ejecuta una llamada a la IA con timeout, reintentos y presupuesto.
+
+    Args:
+        fn: Función que recibe el timeout (segundos) y hace la llamada
+        budget: AIBudget de la ejecución (opcional)
+        label: Nombre para los logs
+
+    Returns:
+        Lo que devuelva fn
+
+    Raises:
+        AIBudgetExceeded: Si no queda tiempo de IA en la ejecución
+        Exception: El último error si no es reintentable o se agotaron los intentos
+    """
+    for attempt in range(Config.AI_MAX_ATTEMPTS):
+        timeout = Config.AI_REQUEST_TIMEOUT
+        if budget is not None:
+            if budget.exhausted():
+                raise AIBudgetExceeded()
+            timeout = min(timeout, budget.remaining())
+
+        started = time.monotonic()
+        try:
+            result = fn(timeout)
+            elapsed = time.monotonic() - started
+            if budget is not None:
+                budget.charge(elapsed)
+            metrics.observe("workana_ai_request_seconds", elapsed, provider=label)
+            metrics.inc("workana_ai_requests_total", provider=label, result="ok")
+            return result
+        except Exception as e:
+            elapsed = time.monotonic() - started
+            if budget is not None:
+                budget.charge(elapsed)
+            metrics.observe("workana_ai_request_seconds", elapsed, provider=label)
+            if not is_retryable(e) or attempt == Config.AI_MAX_ATTEMPTS - 1:
+                metrics.inc("workana_ai_requests_total", provider=label, result="error")
+                raise
+            metrics.inc("workana_ai_requests_total", provider=label, result="retry")
+            delay = backoff_delay(attempt)
+            if budget is not None and delay >= budget.remaining():
+                raise AIBudgetExceeded()
+            logger.warning(f"      🔁 {label}: error transitorio ({type(e).__name__}). Reintento en {delay:.1f}s")
+            time.sleep(delay)
+            if budget is not None:
+                budget.charge(delay)
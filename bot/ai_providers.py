@@ -0,0 +1,223 @@
+"""
+Proveedores de IA intercambiables.
+
+Cada backend implementa AIProvider.complete() y se registra con
+@register_provider. Backends incluidos:
+- openai: GPT-4o-mini
+- gemini: modelos Flash/Pro, con fallback entre modelos
+- local: endpoint compatible con OpenAI en la misma máquina (llama.cpp, vLLM)
+- stub: respuestas deterministas sin red (para pruebas)
+"""
+
+import re
+import json
+import time
+import zlib
+from abc import ABC, abstractmethod
+
+from .config import Config
+from .logger import logger
+from .ai_client import AIBudgetExceeded, call_with_retry, get_openai_client
+
+
+PROVIDERS = {}
+
+SYSTEM_MESSAGE = "Eres un asistente que analiza proyectos freelance y devuelve SOLO JSON válido."
+
+
+def register_provider(name):
+    """Decorador que registra una clase de proveedor bajo un nombre."""
+    def decorator(cls):
+        cls.name = name
+        PROVIDERS[name] = cls
+        return cls
+    return decorator
+
+
+def create_provider(name):
+    """
+    Instancia un proveedor registrado.
+
+    Raises:
+        ValueError: Si el proveedor no existe o le falta configuración
+    """
+    name = (name or "").lower()
+    if name not in PROVIDERS:
+        raise ValueError(f"❌ Proveedor desconocido: {name} (disponibles: {', '.join(sorted(PROVIDERS))})")
+    return PROVIDERS[name]()
+
+
+def log_usage(model, started, prompt_tokens, completion_tokens, cached_tokens=None):
+    """Loguea tokens y latencia de una llamada a la IA."""
+    latency = time.monotonic() - started
+    cached = f" ({cached_tokens} en caché)" if cached_tokens else ""
+    logger.info(
+        f"      📊 IA {model}: {prompt_tokens if prompt_tokens is not None else '?'} tokens prompt{cached} + "
+        f"{completion_tokens if completion_tokens is not None else '?'} respuesta | {latency:.1f}s"
+    )
+
+
+class AIProvider(ABC):
+    """
+    Interfaz de un backend de IA.
+
+    Attributes:
+        name: Nombre con el que se registró
+        json_attempts: Intentos totales si el JSON no es válido ni reparable
+            (el último recurso: la mayoría se repara localmente en ai_schema)
+    """
+
+    name = "base"
+    json_attempts = 2
+
+    @abstractmethod
+    def complete(self, prompt, budget=None, attempt=0):
+        """
+        Envía el prompt y devuelve el texto de la respuesta.
+
+        Args:
+            prompt: Prompt completo
+            budget: AIBudget de la ejecución (opcional)
+            attempt: Número de reintento por JSON inválido (0 = primer intento)
+
+        Returns:
+            str con la respuesta cruda
+
+        Raises:
+            AIBudgetExceeded, o el error del backend si no pudo responder
+        """
+
+
+@register_provider("openai")
+class OpenAIProvider(AIProvider):
+    """OpenAI (GPT-4o-mini): rápido y barato."""
+
+    model = "gpt-4o-mini"
+
+    def __init__(self):
+        if not Config.OPENAI_API_KEY:
+            raise ValueError("❌ FALTA OPENAI_API_KEY")
+        self.client = get_openai_client(Config.OPENAI_API_KEY)
+        print(f"🤖 IA configurada: OpenAI ({self.model})")
+
+    def complete(self, prompt, budget=None, attempt=0):
+        started = time.monotonic()
+        response = call_with_retry(
+            lambda timeout: self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_MESSAGE},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7,
+                response_format={"type": "json_object"},
+                timeout=timeout
+            ),
+            budget, label=self.name
+        )
+        usage = response.usage
+        log_usage(
+            self.model, started,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+            getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', None)
+        )
+        return response.choices[0].message.content
+
+
+@register_provider("local")
+class LocalProvider(OpenAIProvider):
+    """
+    Servidor local compatible con la API de OpenAI (llama.cpp, vLLM, Ollama).
+
+    Pensado para el scoring masivo: sin costo por token.
+    """
+
+    def __init__(self):
+        self.model = Config.LOCAL_AI_MODEL
+        self.client = get_openai_client(Config.LOCAL_AI_KEY, base_url=Config.LOCAL_AI_URL)
+        print(f"🤖 IA configurada: Local ({self.model} @ {Config.LOCAL_AI_URL})")
+
+
+@register_provider("gemini")
+class GeminiProvider(AIProvider):
+    """Gemini: prueba modelos de más rápido a más potente."""
+
+    models = [
+        'models/gemini-2.5-flash-lite',
+        'models/gemini-2.0-flash-lite',
+        'models/gemini-2.5-flash',
+        'models/gemini-2.0-flash',
+        'models/gemini-flash-latest',
+        'models/gemini-2.5-pro'
+    ]
+    json_attempts = len(models)
+
+    def __init__(self):
+        if not Config.GEMINI_API_KEY:
+            raise ValueError("❌ FALTA GEMINI_KEY")
+        import google.generativeai as genai
+        self.genai = genai
+        genai.configure(api_key=Config.GEMINI_API_KEY)
+        print(f"🤖 IA configurada: Gemini")
+
+    def complete(self, prompt, budget=None, attempt=0):
+        # Si el JSON de un modelo no sirvió, el reintento empieza por el siguiente
+        models = self.models[attempt:] or self.models[-1:]
+        last_error = None
+        for m in models:
+            try:
+                model = self.genai.GenerativeModel(m)
+                started = time.monotonic()
+                res = call_with_retry(
+                    lambda timeout: model.generate_content(prompt, request_options={"timeout": timeout}),
+                    budget, label=m
+                )
+                if not res.text:
+                    continue
+                usage = getattr(res, 'usage_metadata', None)
+                log_usage(
+                    m, started,
+                    getattr(usage, 'prompt_token_count', None),
+                    getattr(usage, 'candidates_token_count', None)
+                )
+                return res.text
+            except AIBudgetExceeded:
+                raise
+            except Exception as e:
+                # Mostrar solo el primer error con detalle para debug
+                if last_error is None:
+                    print(f"      ⚠️ Error con {m}: {str(e)[:200]}")
+                last_error = e
+        raise last_error or RuntimeError("Gemini no devolvió texto")
+
+
+@register_provider("stub")
+class StubProvider(AIProvider):
+    """
+    Respuestas deterministas sin red, para pruebas.
+
+    El score depende de palabras clave de automatización en el prompt;
+    el resto de campos se derivan del prompt de forma reproducible.
+    """
+
+    KEYWORDS = ("scraping", "scraper", "bot", "script", "automatiz", "python", "api", "selenium")
+
+    def __init__(self):
+        print("🤖 IA configurada: Stub (offline)")
+
+    def complete(self, prompt, budget=None, attempt=0):
+        data = prompt.split("DATOS DEL PROYECTO:")[-1].lower()
+        hits = sum(1 for k in self.KEYWORDS if k in data)
+        score = min(95, 40 + hits * 15)
+        seed = zlib.crc32(data.encode('utf-8'))
+        budget_match = re.search(r"presupuesto cliente:\D*(\d[\d.,]*)", data)
+        budget_value = int(re.sub(r"\D", "", budget_match.group(1))) if budget_match else 100
+        return json.dumps({
+            "is_relevant": score >= Config.MIN_SCORE_TO_BID,
+            "score": score,
+            "reason": f"stub: {hits} palabras clave de automatización",
+            "delivery_days": 2 + seed % 4,
+            "proposal_text": "Leí tu requerimiento. Puedo resolverlo con una solución automatizada. ¿Tienes la documentación lista?",
+            "suggested_price": max(1, int(budget_value * 0.5))
+        })
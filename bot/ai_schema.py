@@ -0,0 +1,266 @@
+"""
+Validación y reparación local de las respuestas JSON de la IA.
+
+Los modelos a veces devuelven JSON casi válido: bloques ```json, texto antes
+o después del objeto, comillas simples, comas finales o números como texto
+("85", "3 días"). Antes cualquiera de esos defectos costaba una llamada más
+(o rompía run() al leer una clave faltante). Aquí se reparan localmente y se
+valida el resultado contra un esquema; solo si no hay arreglo posible se
+vuelve a consultar a la IA.
+"""
+
+import re
+import ast
+import json
+
+from .config import Config
+from . import metrics
+
+
+# Campo → (tipo, requerido, mínimo, máximo)
+SCORING_SCHEMA = {
+    "is_relevant": (bool, False, None, None),
+    "score": (int, True, 0, 100),
+    "reason": (str, False, None, None),
+}
+
+ANALYSIS_SCHEMA = dict(SCORING_SCHEMA, **{
+    "delivery_days": (int, True, 1, 365),
+    "proposal_text": (str, True, None, None),
+    "suggested_price": (int, False, 1, None),
+})
+
+SMART_QUOTES = {"“": '"', "”": '"', "‘": "'", "’": "'"}
+
+# Strings entre comillas dobles o simples (con escapes)
+STRING_RE = re.compile(r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'""")
+JSON_LITERALS = {"true": "True", "false": "False", "null": "None"}
+LITERAL_RE = re.compile(r"\b(true|false|null)\b")
+
+# Contadores de la ejecución (también exportados como métricas)
+stats = {"responses": 0, "repairs": 0, "requeries_avoided": 0, "requeries": 0, "invalid": 0}
+
+
+def reset_stats():
+    """Pone en cero los contadores al empezar una ejecución."""
+    for key in stats:
+        stats[key] = 0
+
+
+def python_literals(text):
+    """true/false/null → True/False/None, solo fuera de los strings."""
+    def replace(chunk):
+        return LITERAL_RE.sub(lambda m: JSON_LITERALS[m.group(1)], chunk)
+
+    parts = []
+    last = 0
+    for match in STRING_RE.finditer(text):
+        parts.append(replace(text[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(replace(text[last:]))
+    return "".join(parts)
+
+
+def extract_object(text):
+    """Primer objeto {...} balanceado del texto (respetando strings)."""
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = None
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == in_string:
+                in_string = None
+        elif char in "\"'":
+            in_string = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def parse_candidates(text):
+    """
+    Intenta parsear el texto y, si falla, el objeto que contiene.
+
+    Returns:
+        Tupla (dict o None, reparaciones aplicadas)
+    """
+    candidates = [text]
+    obj = extract_object(text)
+    if obj is not None and obj != text:
+        candidates.append(obj)
+
+    for candidate in candidates:
+        extra = [] if candidate is text else ["surrounding_text"]
+        try:
+            data = json.loads(candidate)
+            if isinstance(data, dict):
+                return data, extra
+            continue
+        except ValueError:
+            pass
+
+        no_trailing = re.sub(r",\s*([}\]])", r"\1", candidate)
+        if no_trailing != candidate:
+            try:
+                data = json.loads(no_trailing)
+                if isinstance(data, dict):
+                    return data, extra + ["trailing_comma"]
+            except ValueError:
+                pass
+
+        # Comillas simples / true-false-null: parsear como literal de Python
+        literal = python_literals(no_trailing)
+        try:
+            data = ast.literal_eval(literal)
+            if isinstance(data, dict):
+                return {str(k): v for k, v in data.items()}, extra + ["single_quotes"]
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            pass
+    return None, []
+
+
+def repair_json(text):
+    """
+    Parsea la respuesta reparando defectos comunes.
+
+    Returns:
+        Tupla (dict o None, lista de reparaciones aplicadas)
+    """
+    repairs = []
+    text = (text or "").strip()
+    if "```" in text:
+        text = re.sub(r"```(?:json)?", "", text).strip()
+        repairs.append("fence")
+
+    data, extra = parse_candidates(text)
+    if data is None and any(smart in text for smart in SMART_QUOTES):
+        # Comillas tipográficas como delimitadores (solo si no parseó tal cual:
+        # dentro del texto de la propuesta son válidas)
+        for smart, plain in SMART_QUOTES.items():
+            text = text.replace(smart, plain)
+        data, extra = parse_candidates(text)
+        extra = ["smart_quotes"] + extra
+    if data is None:
+        return None, repairs
+    return data, repairs + extra
+
+
+def coerce(value, kind):
+    """
+    Convierte un valor al tipo del esquema.
+
+    Returns:
+        Tupla (valor, fue_convertido); valor None si no se pudo
+    """
+    if kind is bool:
+        if isinstance(value, bool):
+            return value, False
+        text = str(value).strip().lower()
+        if text in ("true", "sí", "si", "yes", "1"):
+            return True, True
+        if text in ("false", "no", "0"):
+            return False, True
+        return None, False
+    if kind is int:
+        if isinstance(value, bool):
+            return None, False
+        if isinstance(value, int):
+            return value, False
+        if isinstance(value, float):
+            return int(round(value)), True
+        # "85", "85/100", "$1.500", "3 días"
+        match = re.search(r"\d[\d.,]*", str(value))
+        if not match:
+            return None, False
+        number = re.sub(r"(?<=\d)[.,](?=\d{3}\b)", "", match.group(0)).replace(",", ".")
+        try:
+            return int(round(float(number))), True
+        except ValueError:
+            return None, False
+    if isinstance(value, str):
+        return value.strip(), False  # Recortar espacios no cuenta como reparación
+    if value is None:
+        return None, False
+    return str(value), True
+
+
+def validate(data, schema):
+    """
+    Valida y normaliza el dict contra el esquema.
+
+    Returns:
+        Tupla (dict válido o None, reparaciones, errores)
+    """
+    clean = dict(data)
+    repairs = []
+    errors = []
+    for field, (kind, required, low, high) in schema.items():
+        if clean.get(field) in (None, ""):
+            if required:
+                errors.append(f"falta {field}")
+            clean[field] = "" if kind is str else None
+            continue
+        value, converted = coerce(clean[field], kind)
+        if value is None:
+            errors.append(f"{field} inválido: {str(clean[field])[:30]}")
+            continue
+        if converted:
+            repairs.append(f"{field}_type")
+        if low is not None and value < low:
+            value = low
+            repairs.append(f"{field}_range")
+        if high is not None and value > high:
+            value = high
+            repairs.append(f"{field}_range")
+        clean[field] = value
+
+    if "is_relevant" in schema and clean.get("is_relevant") is None and clean.get("score") is not None:
+        clean["is_relevant"] = clean["score"] >= Config.MIN_SCORE_TO_BID
+    if errors:
+        return None, repairs, errors
+    return clean, repairs, errors
+
+
+def parse_response(text, schema):
+    """
+    Parsea, repara y valida una respuesta de la IA.
+
+    Returns:
+        Tupla (dict válido o None, lista de reparaciones, lista de errores)
+    """
+    stats["responses"] += 1
+    data, repairs = repair_json(text)
+    if data is None:
+        stats["invalid"] += 1
+        return None, repairs, ["JSON ilegible"]
+    clean, field_repairs, errors = validate(data, schema)
+    repairs += field_repairs
+    if clean is None:
+        stats["invalid"] += 1
+        return None, repairs, errors
+    if repairs:
+        stats["repairs"] += len(repairs)
+        # Los bloques ``` ya se limpiaban antes: no cuentan como re-consulta evitada
+        if any(kind != "fence" for kind in repairs):
+            stats["requeries_avoided"] += 1
+        for kind in repairs:
+            metrics.inc("workana_ai_json_repairs_total", kind=kind)
+    return clean, repairs, errors
+
+
+def record_requery():
+    stats["requeries"] += 1
+    metrics.inc("workana_ai_requeries_total")
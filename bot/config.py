@@ -17,10 +17,22 @@ class Config:
     # Credenciales (desde archivo .env)
     WORKANA_EMAIL = os.getenv("WORKANA_EMAIL")
     WORKANA_PASS = os.getenv("WORKANA_PASS")
-    # IA: Soporta "gemini" u "openai"
-    AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").lower()  # Por defecto OpenAI
+    # IA: Soporta "gemini", "openai", "local" (servidor compatible con OpenAI) o "stub" (pruebas)
+    AI_PROVIDER = os.getenv("AI_PROVIDER", "openai").lower()  # Redacción de propuestas. Por defecto OpenAI
+    AI_SCORING_PROVIDER = os.getenv("AI_SCORING_PROVIDER", "").lower()  # Fase de scoring (vacío = mismo que AI_PROVIDER)
     GEMINI_API_KEY = os.getenv("GEMINI_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    AI_HEDGE_PROVIDER = os.getenv("AI_HEDGE_PROVIDER", "").lower()  # Proveedor secundario para hedging (vacío = desactivado)
+    AI_HEDGE_AFTER_SECONDS = float(os.getenv("AI_HEDGE_AFTER_SECONDS", "8"))  # p90 inicial del principal
+    LOCAL_AI_URL = os.getenv("LOCAL_AI_URL", "http://127.0.0.1:8080/v1")  # llama.cpp / vLLM en la misma máquina
+    LOCAL_AI_MODEL = os.getenv("LOCAL_AI_MODEL", "local-model")
+    LOCAL_AI_KEY = os.getenv("LOCAL_AI_KEY", "sk-local")
+    AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "45"))  # Timeout por request (segundos)
+    AI_MAX_ATTEMPTS = 4  # Intentos por request ante rate-limit / 5xx
+    AI_BACKOFF_BASE = 2.0  # Backoff exponencial con jitter (segundos)
+    AI_BACKOFF_MAX = 30.0
+    AI_RUN_BUDGET_SECONDS = float(os.getenv("AI_RUN_BUDGET_SECONDS", "600"))  # Tiempo total de IA por ejecución (solo llamadas, no esperas del bot)
+    AI_DESCRIPTION_MAX_TOKENS = int(os.getenv("AI_DESCRIPTION_MAX_TOKENS", "800"))  # Presupuesto para la descripción en el prompt
     
     # URLs de Workana
     BASE_URL = "https://www.workana.com"
@@ -29,8 +41,26 @@ class Config:
     
     # Archivos de datos (en carpeta data/)
     DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-    COOKIES_FILE = os.path.join(DATA_DIR, "workana_cookies.pkl")
+    COOKIES_FILE = os.path.join(DATA_DIR, "workana_cookies.json")
+    LEGACY_COOKIES_FILE = os.path.join(DATA_DIR, "workana_cookies.pkl")  # Formato antiguo (se migra solo)
+    COOKIES_MAX_AGE_DAYS = 30  # Vida asumida de la sesión si las cookies no traen expiración
     HISTORY_FILE = os.path.join(DATA_DIR, "history_proposals.json")
+    DEDUP_INDEX_FILE = os.path.join(DATA_DIR, "dedup_index.json")  # Firmas MinHash de proyectos analizados
+    POSTING_HISTOGRAM_FILE = os.path.join(DATA_DIR, "posting_histogram.json")  # Horas de publicación observadas
+    SCHEDULER_STATE_FILE = os.path.join(DATA_DIR, "scheduler_state.json")  # Última ejecución programada
+    RUN_CHECKPOINT_FILE = os.path.join(DATA_DIR, "run_checkpoint.json")  # Cola/análisis/precios de la ejecución en curso
+    RETRY_QUEUE_FILE = os.path.join(DATA_DIR, "retry_queue.json")  # Envíos fallidos por errores transitorios
+    DETAIL_CACHE_FILE = os.path.join(DATA_DIR, "detail_cache.json")  # Descripciones completas por slug
+    SELECTOR_STATS_FILE = os.path.join(DATA_DIR, "selector_stats.json")  # Aciertos por selector
+    DRIVER_CACHE_DIR = os.path.join(DATA_DIR, "drivers")  # chromedriver parcheado por versión de Chrome
+    DRIVER_STATE_FILE = os.path.join(DATA_DIR, "driver_state.json")  # Último arranque exitoso
+    WATCHDOG_STATS_FILE = os.path.join(DATA_DIR, "watchdog_stats.json")  # Cuelgues y reinicios de Chrome
+    
+    # Perfil persistente de Chrome
+    CHROME_PROFILE_DIR = os.path.join(os.getcwd(), "chrome_profile")
+    CHROME_PROFILE_MAX_MB = int(os.getenv("CHROME_PROFILE_MAX_MB", "300"))  # Tope del perfil antes de podar cachés
+    DRIVER_FALLBACK_AFTER_FAILURES = 3  # Fallos seguidos del modo "advanced" antes de arrancar directo en "basic"
+    DRIVER_RETRY_PREFERRED_RUNS = 10  # Arranques en "basic" tras los que se vuelve a probar "advanced"
     
     # Límites y umbrales
     MAX_PROPOSALS_PER_DAY = 7  # Máximo de propuestas por día
@@ -39,6 +69,32 @@ class Config:
     MIN_SCORE_TO_BID = 65  # Score mínimo para ofertar (0-100)
     PRICE_PERCENTAGE = 0.70  # Porcentaje del insight a usar (70%)
     MIN_BIDS_FOR_INSIGHT = 5  # Mínimo de propuestas para usar insight en lugar de IA
+    ENRICH_SCORE_MARGIN = 15  # Scores a +/- esto del mínimo se re-analizan con la descripción completa
+    ENRICH_MIN_EXTRA_CHARS = 40  # Si la página no agrega al menos esto, la tarjeta no estaba recortada
+    DETAIL_CACHE_MAX_ENTRIES = 2000
+    PREFETCH_CHECK_SECONDS = 20  # Durante la espera entre propuestas se revisa así de seguido la página precargada
+    DEDUP_THRESHOLD = 0.8  # Similitud (Jaccard estimada) desde la que un proyecto se considera repost
+    
+    # Reanudación y reintentos
+    CHECKPOINT_MAX_AGE_MINUTES = 180  # Un checkpoint más viejo se descarta y se re-escanea
+    RETRY_BASE_MINUTES = 30  # Backoff de reintentos: 30 min, 1 h, 2 h...
+    RETRY_MAX_ATTEMPTS = 4
+    
+    # Watchdog (scheduler): el navegador corre en un proceso hijo vigilado
+    PAGE_LOAD_TIMEOUT = 60  # driver.get() falla en vez de colgar (segundos)
+    SCRIPT_TIMEOUT = 30  # execute_async_script (segundos)
+    COMMAND_TIMEOUT_SECONDS = int(os.getenv("COMMAND_TIMEOUT_SECONDS", "150"))  # Un comando de Selenium que tarda más se considera colgado
+    RUN_DEADLINE_MINUTES = int(os.getenv("RUN_DEADLINE_MINUTES", "90"))  # Tope de una ejecución completa
+    WATCHDOG_MAX_RESTARTS = 2  # Reinicios de Chrome por ejecución
+    
+    # Métricas Prometheus del scheduler (http://127.0.0.1:PUERTO/metrics)
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 = desactivado
+    
+    # Scheduler adaptativo
+    LOW_BID_THRESHOLD = 10  # Un proyecto con menos propuestas que esto cuenta como "poca competencia"
+    SCHEDULE_FRESH_HOURS = 8  # Cada ejecución aprovecha lo publicado en estas horas previas
+    SCHEDULE_HOURS = range(8, 22)  # Horas permitidas para ejecutar (comportamiento humano)
+    MISSED_SLOT_GRACE_HOURS = 4  # Un horario perdido (VPS caído) se recupera si pasó hace menos de esto
     
     # Configuración VPS
     HEADLESS_MODE = os.getenv("HEADLESS_MODE", "false").lower() == "true"  # Modo headless para VPS
@@ -0,0 +1,146 @@
+"""
+Almacén de cookies de sesión en JSON con índice de expiración.
+
+Reemplaza al antiguo data/workana_cookies.pkl:
+- Guarda las cookies junto con la fecha de expiración de la sesión
+- Detecta sesiones expiradas sin tocar el navegador
+- Inyecta todas las cookies en una sola llamada CDP (Network.setCookies)
+"""
+
+import os
+import json
+import time
+import pickle
+from datetime import datetime
+
+from .config import Config
+from .logger import logger
+
+
+# Valores de sameSite aceptados por CDP
+SAME_SITE_VALUES = {"strict": "Strict", "lax": "Lax", "none": "None"}
+
+
+class CookieStore:
+    """
+    Cookies de sesión persistidas en disco.
+
+    Formato del archivo:
+        {
+            "saved_at": "2024-01-16T10:00:00",
+            "expires_at": 1705400000,   # epoch de la última cookie de sesión que expira
+            "cookies": [ {name, value, domain, path, expiry, ...}, ... ]
+        }
+    """
+
+    def __init__(self, path=None, legacy_path=None):
+        self.path = path or Config.COOKIES_FILE
+        self.legacy_path = legacy_path or Config.LEGACY_COOKIES_FILE
+        self.data = self.load()
+
+    def load(self):
+        """Carga el archivo JSON (migrando el .pkl antiguo si hace falta)."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠️ Archivo de cookies ilegible: {e}")
+                return {}
+
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, 'rb') as f:
+                    cookies = pickle.load(f)
+                logger.info(f"🔄 Migrando {len(cookies)} cookies de .pkl a JSON...")
+                saved_at = datetime.fromtimestamp(os.path.getmtime(self.legacy_path))
+                return self.save(cookies, saved_at=saved_at)
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo migrar el archivo .pkl de cookies: {e}")
+        return {}
+
+    @property
+    def cookies(self):
+        return self.data.get("cookies", [])
+
+    @staticmethod
+    def compute_expiry(cookies, saved_at):
+        """
+        Calcula cuándo expira la sesión.
+
+        Se usan las cookies httpOnly de Workana (las de autenticación), no las
+        de analytics que duran minutos. Se toma la que vence más tarde: entre
+        las httpOnly también hay cookies cortas (anti-bot, CSRF) que se renuevan
+        solas y no invalidan la sesión; las ya vencidas las descarta to_cdp.
+        Si ninguna tiene expiración, se asume una vida máxima de
+        COOKIES_MAX_AGE_DAYS desde que se guardaron.
+        """
+        session_expiries = [
+            c['expiry'] for c in cookies
+            if c.get('expiry') and c.get('httpOnly') and 'workana' in c.get('domain', '')
+        ]
+        if session_expiries:
+            return int(max(session_expiries))
+        return int(saved_at.timestamp() + Config.COOKIES_MAX_AGE_DAYS * 86400)
+
+    def save(self, cookies, saved_at=None):
+        """
+        Guarda las cookies (formato de driver.get_cookies()) con su expiración.
+
+        Returns:
+            Dict guardado
+        """
+        saved_at = saved_at or datetime.now()
+        self.data = {
+            "saved_at": saved_at.isoformat(),
+            "expires_at": self.compute_expiry(cookies, saved_at),
+            "cookies": cookies
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        return self.data
+
+    def is_expired(self, now=None):
+        """True si no hay cookies o la sesión guardada ya expiró."""
+        if not self.cookies:
+            return True
+        expires_at = self.data.get("expires_at")
+        if not expires_at:
+            return False
+        return (now or time.time()) >= expires_at
+
+    def to_cdp(self):
+        """Convierte las cookies al formato de Network.setCookies."""
+        now = time.time()
+        result = []
+        for c in self.cookies:
+            if c.get('expiry') and c['expiry'] <= now:
+                continue
+            cookie = {
+                "name": c['name'],
+                "value": c['value'],
+                "domain": c.get('domain', '.workana.com'),
+                "path": c.get('path', '/'),
+                "secure": bool(c.get('secure', False)),
+                "httpOnly": bool(c.get('httpOnly', False)),
+            }
+            if c.get('expiry'):
+                cookie["expires"] = c['expiry']
+            same_site = SAME_SITE_VALUES.get(str(c.get('sameSite', '')).lower())
+            if same_site:
+                cookie["sameSite"] = same_site
+            result.append(cookie)
+        return result
+
+    def inject(self, driver):
+        """
+        Inyecta todas las cookies vigentes en una sola llamada CDP.
+
+        Returns:
+            Número de cookies inyectadas
+        """
+        cookies = self.to_cdp()
+        if cookies:
+            driver.execute_cdp_cmd('Network.setCookies', {"cookies": cookies})
+        return len(cookies)
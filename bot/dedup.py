@@ -0,0 +1,243 @@
+"""
+Detección de proyectos re-publicados (casi duplicados) con MinHash + LSH.
+
+Los clientes suelen re-publicar el mismo trabajo con otra URL. El filtro por
+URL del historial no lo detecta y se gasta otra llamada a la IA (y a veces
+una segunda oferta). Este índice guarda una firma MinHash compacta de
+título + descripción de cada proyecto analizado y, con bandas LSH, encuentra
+candidatos parecidos sin comparar contra todo el historial.
+"""
+
+import os
+import re
+import json
+import base64
+import hashlib
+from array import array
+from datetime import datetime
+
+from .config import Config
+from .logger import logger
+from .project import project_slug
+from .run_state import write_json_atomic
+
+
+NUM_PERM = 64       # Bins de la firma (64 x 32 bits = 256 bytes)
+BANDS = 16          # 16 bandas x 4 filas: detecta con alta probabilidad Jaccard >= ~0.7
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3    # Shingles de 3 palabras
+SIGNATURE_VERSION = 2  # Firmas de otra versión no son comparables: el índice se reconstruye
+_MAX_HASH = 0xFFFFFFFF
+_BIN_BITS = NUM_PERM.bit_length() - 1
+_DENSIFY_OFFSET = 0x9E3779B1  # Separa los valores copiados a bins vacíos de los originales
+
+
+def shingles(text):
+    """Conjunto de shingles de palabras del texto normalizado."""
+    words = re.findall(r"\w+", (text or "").lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """
+    Firma MinHash de una sola permutación (array de NUM_PERM enteros de 32 bits).
+
+    Cada shingle se hashea una vez: los bits bajos eligen el bin y el resto es
+    el valor, y cada bin guarda su mínimo. Es O(shingles) en vez de
+    O(shingles x permutaciones). Los bins vacíos (textos cortos) copian el
+    valor del siguiente bin con datos (densificación por rotación).
+    """
+    bins = [None] * NUM_PERM
+    for s in shingles(text):
+        h = int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+        b = h & (NUM_PERM - 1)
+        value = (h >> _BIN_BITS) & _MAX_HASH
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+    if all(value is None for value in bins):
+        return array('I', [_MAX_HASH] * NUM_PERM)
+
+    sig = array('I', [0] * NUM_PERM)
+    for i in range(NUM_PERM):
+        distance = 0
+        while bins[(i + distance) % NUM_PERM] is None:
+            distance += 1
+        sig[i] = (bins[(i + distance) % NUM_PERM] + distance * _DENSIFY_OFFSET) & _MAX_HASH
+    return sig
+
+
+def similarity(sig_a, sig_b):
+    """Estimación de similitud de Jaccard entre dos firmas."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(sig):
+    """Claves LSH de cada banda de la firma."""
+    raw = sig.tobytes()
+    size = ROWS * sig.itemsize
+    return [f"{i}:{raw[i * size:(i + 1) * size].hex()}" for i in range(BANDS)]
+
+
+class DedupIndex:
+    """
+    Índice MinHash/LSH persistido junto al historial (data/dedup_index.json).
+
+    Formato:
+        {"version": 2, "entries": [{"url", "sig" (base64), "decision", "score", "timestamp"}, ...]}
+
+    Cada add() se agrega además a dedup_index.json.journal (una entrada JSON
+    por línea) en el momento: si el watchdog mata el worker sin pasar por
+    save(), la próxima carga reaplica el journal y no se pierde lo analizado.
+    save() reescribe el índice completo y borra el journal.
+    """
+
+    def __init__(self, path=None, threshold=None):
+        self.path = path or Config.DEDUP_INDEX_FILE
+        self.journal_path = self.path + ".journal"
+        self.threshold = threshold if threshold is not None else Config.DEDUP_THRESHOLD
+        self.entries = []
+        self.signatures = []
+        self.buckets = {}
+        self.positions = {}  # slug → posición, para no duplicar ni compararse consigo mismo
+        self.dirty = False
+        self.last_signature = (None, None)  # (texto, firma): evita recalcular entre find y add
+        self.load()
+
+    @staticmethod
+    def text_of(project):
+        return f"{project.title} {project.description}"
+
+    def load(self):
+        """Carga el índice (y el journal pendiente) y reconstruye las bandas LSH en memoria."""
+        data = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠️ Índice de duplicados ilegible, se empieza de cero: {e}")
+            if data and data.get("version") != SIGNATURE_VERSION:
+                logger.info("♻️ Índice de duplicados con firmas de una versión anterior: se reconstruye desde cero.")
+                self.dirty = True
+                data = {}
+        for entry in data.get("entries", []):
+            self.restore(entry)
+        self.replay_journal()
+
+    def replay_journal(self):
+        """Aplica las entradas agregadas después del último save() (ejecución cortada)."""
+        if not os.path.exists(self.journal_path):
+            return
+        replayed = 0
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Última línea a medio escribir al matar el proceso
+                if entry.pop("version", None) != SIGNATURE_VERSION:
+                    continue
+                position = self.positions.get(project_slug(entry['url']))
+                if position is not None:
+                    self.entries[position].update(entry)
+                else:
+                    self.restore(entry)
+                replayed += 1
+        if replayed:
+            logger.info(f"♻️ Índice de duplicados: {replayed} entradas recuperadas del journal.")
+            self.dirty = True
+
+    def restore(self, entry):
+        sig = array('I')
+        sig.frombytes(base64.b64decode(entry['sig']))
+        self.index(entry, sig)
+
+    def append_journal(self, entry):
+        try:
+            os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(dict(entry, version=SIGNATURE_VERSION), ensure_ascii=False) + "\n")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo escribir el journal de duplicados: {e}")
+
+    def save(self):
+        """Guarda el índice completo si cambió y descarta el journal."""
+        if not self.dirty:
+            return
+        try:
+            write_json_atomic(self.path, {"version": SIGNATURE_VERSION, "entries": self.entries}, indent=None)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar el índice de duplicados: {e}")
+
+    def signature(self, project):
+        """Firma del proyecto (reusa la última si el texto no cambió)."""
+        text = self.text_of(project)
+        if self.last_signature[0] != text:
+            self.last_signature = (text, minhash(text))
+        return self.last_signature[1]
+
+    def index(self, entry, sig):
+        position = len(self.entries)
+        self.positions[project_slug(entry['url'])] = position
+        self.entries.append(entry)
+        self.signatures.append(sig)
+        for key in band_keys(sig):
+            self.buckets.setdefault(key, []).append(position)
+
+    def find_duplicate(self, project):
+        """
+        Busca otro proyecto ya analizado casi idéntico.
+
+        El mismo proyecto (misma URL, p. ej. aceptado pero no enviado en una
+        ejecución anterior) no cuenta como repost de sí mismo.
+
+        Returns:
+            Tupla (entrada, similitud) o (None, 0.0)
+        """
+        sig = self.signature(project)
+        candidates = set()
+        for key in band_keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(self.positions.get(project.slug))
+
+        best, best_score = None, 0.0
+        for position in candidates:
+            score = similarity(sig, self.signatures[position])
+            if score > best_score:
+                best, best_score = self.entries[position], score
+        if best is not None and best_score >= self.threshold:
+            return best, best_score
+        return None, 0.0
+
+    def add(self, project, decision, score=None):
+        """
+        Registra un proyecto analizado.
+
+        Args:
+            project: Project
+            decision: "accepted" o "rejected"
+            score: Score de la IA
+        """
+        position = self.positions.get(project.slug)
+        if position is not None:
+            # Re-análisis del mismo proyecto: actualizar la decisión sin otra entrada
+            self.entries[position].update(decision=decision, score=score, timestamp=datetime.now().isoformat())
+            self.append_journal(self.entries[position])
+            self.dirty = True
+            return
+        sig = self.signature(project)
+        entry = {
+            "url": project.url,
+            "sig": base64.b64encode(sig.tobytes()).decode('ascii'),
+            "decision": decision,
+            "score": score,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.index(entry, sig)
+        self.append_journal(entry)
+        self.dirty = True
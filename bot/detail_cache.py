@@ -0,0 +1,58 @@
+"""
+Caché de descripciones completas de proyectos (data/detail_cache.json).
+
+La descripción de la tarjeta del listado suele venir recortada. Solo los
+candidatos con score cerca del umbral se enriquecen con la página completa
+del proyecto; el resultado se guarda por slug para no volver a abrir la
+página si el proyecto reaparece (checkpoint, reintentos, otra ejecución).
+"""
+
+import os
+import json
+from datetime import datetime
+
+from .config import Config
+from .logger import logger
+from .run_state import write_json_atomic
+
+
+class DetailCache:
+    """
+    Descripciones por slug.
+
+    Formato:
+        {"slug": {"description": "...", "fetched_at": "2024-01-16T10:00:00"}, ...}
+    """
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or Config.DETAIL_CACHE_FILE
+        self.max_entries = max_entries or Config.DETAIL_CACHE_MAX_ENTRIES
+        self.entries = {}
+        self.dirty = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠️ Caché de descripciones ilegible, se empieza de cero: {e}")
+
+    def get(self, slug):
+        entry = self.entries.get(slug)
+        return entry['description'] if entry else None
+
+    def put(self, slug, description):
+        self.entries[slug] = {"description": description, "fetched_at": datetime.now().isoformat()}
+        self.dirty = True
+
+    def save(self):
+        """Guarda la caché si cambió, descartando las entradas más viejas por encima del tope."""
+        if not self.dirty:
+            return
+        if len(self.entries) > self.max_entries:
+            newest = sorted(self.entries.items(), key=lambda item: item[1]['fetched_at'], reverse=True)
+            self.entries = dict(newest[:self.max_entries])
+        try:
+            write_json_atomic(self.path, self.entries, indent=None)
+            self.dirty = False
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar la caché de descripciones: {e}")
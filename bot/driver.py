@@ -0,0 +1,239 @@
+"""
+Arranque del navegador Chrome para el bot.
+
+Este módulo se encarga de:
+- Detectar la versión de Chrome instalada
+- Cachear el chromedriver parcheado por versión (sin re-parchear ni descargar)
+- Recordar cuándo el modo preferido falla seguido para arrancar directo en
+  el de respaldo (un solo intento), volviendo a probar el preferido cada tanto
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import subprocess
+from datetime import datetime
+import undetected_chromedriver as uc
+
+from .config import Config
+from .logger import logger
+from .profile import maintain_profile
+
+
+# Modos de arranque, en orden de preferencia por defecto
+DRIVER_MODES = ["advanced", "basic"]
+
+
+def detect_chrome_version():
+    """
+    Detecta la versión principal (major) de Chrome instalada.
+
+    Returns:
+        int con la versión (ej: 120) o None si no se pudo detectar
+    """
+    # Windows: la versión está en el registro (chrome --version no imprime nada)
+    if os.name == "nt":
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon")
+            version, _ = winreg.QueryValueEx(key, "version")
+            return int(version.split(".")[0])
+        except Exception:
+            pass
+
+    try:
+        chrome_path = uc.find_chrome_executable()
+        if not chrome_path:
+            return None
+        output = subprocess.check_output(
+            [chrome_path, "--version"], stderr=subprocess.DEVNULL, timeout=10
+        ).decode(errors="ignore")
+        match = re.search(r"(\d+)\.\d+", output)
+        return int(match.group(1)) if match else None
+    except Exception:
+        return None
+
+
+def build_options(mode):
+    """
+    Construye las opciones de Chrome para un modo de arranque.
+
+    Args:
+        mode: "advanced" (anti-detección completa) o "basic" (mínima para VPS)
+    """
+    options = uc.ChromeOptions()
+
+    if mode == "advanced":
+        # 🛡️ CONFIGURACIÓN ANTI-DETECCIÓN
+        options.add_argument(f'--user-data-dir={Config.CHROME_PROFILE_DIR}')
+        options.add_argument('--profile-directory=Default')
+
+    # Modo headless para VPS (sin interfaz gráfica)
+    if Config.HEADLESS_MODE:
+        options.add_argument('--headless=new')
+        options.add_argument('--disable-gpu')
+    else:
+        options.add_argument('--start-maximized')
+
+    # Opciones críticas para VPS
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--window-size=1920,1080')  # Tamaño fijo para headless
+
+    if mode == "advanced":
+        options.add_argument('--lang=es-ES,es')
+        options.add_argument('--accept-lang=es-ES,es;q=0.9')
+
+        # Preferencias de usuario
+        prefs = {
+            "credentials_enable_service": False,
+            "profile.password_manager_enabled": False,
+            "profile.default_content_setting_values.notifications": 2
+        }
+        options.add_experimental_option("prefs", prefs)
+
+    return options
+
+
+def load_driver_state():
+    """Carga la última configuración de arranque exitosa."""
+    if os.path.exists(Config.DRIVER_STATE_FILE):
+        try:
+            with open(Config.DRIVER_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except:
+            return {}
+    return {}
+
+
+def save_driver_state(state):
+    """Guarda la configuración de arranque exitosa."""
+    try:
+        os.makedirs(os.path.dirname(Config.DRIVER_STATE_FILE), exist_ok=True)
+        with open(Config.DRIVER_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo guardar el estado del driver: {e}")
+
+
+def get_cached_driver_path(chrome_version):
+    """Ruta del chromedriver parcheado en caché para una versión de Chrome."""
+    name = f"chromedriver_{chrome_version}"
+    if os.name == "nt":
+        name += ".exe"
+    return os.path.join(Config.DRIVER_CACHE_DIR, name)
+
+
+def cache_driver_binary(driver, cached_path):
+    """Copia el chromedriver recién parcheado por uc a la caché."""
+    try:
+        source = driver.patcher.executable_path
+        if source and os.path.exists(source) and os.path.abspath(source) != os.path.abspath(cached_path):
+            os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+            shutil.copy2(source, cached_path)
+            logger.info(f"   💾 Chromedriver cacheado: {os.path.basename(cached_path)}")
+    except Exception as e:
+        logger.warning(f"   ⚠️ No se pudo cachear el chromedriver: {e}")
+
+
+def choose_modes(state):
+    """
+    Orden en que se prueban los modos de arranque.
+
+    Un fallo suelto del modo preferido ("advanced", con el perfil persistente)
+    no alcanza para abandonarlo: recién tras DRIVER_FALLBACK_AFTER_FAILURES
+    fallos seguidos se arranca directo en "basic", y cada
+    DRIVER_RETRY_PREFERRED_RUNS arranques se vuelve a probar "advanced".
+    """
+    modes = list(DRIVER_MODES)
+    failures = state.get("preferred_failures", 0)
+    fallback_runs = state.get("fallback_runs", 0)
+    if failures >= Config.DRIVER_FALLBACK_AFTER_FAILURES and fallback_runs < Config.DRIVER_RETRY_PREFERRED_RUNS:
+        modes.append(modes.pop(0))
+    return modes
+
+
+def create_driver():
+    """
+    Inicia Chrome en un solo intento usando la caché y el modo que corresponda.
+
+    Solo si el arranque falla se prueba el siguiente modo (y se descarta
+    el driver cacheado, por si está corrupto).
+
+    Returns:
+        Instancia de uc.Chrome
+    """
+    # Podar el perfil antes de que Chrome lo abra
+    try:
+        maintain_profile()
+    except Exception as e:
+        logger.warning(f"⚠️ Error en mantenimiento del perfil: {e}")
+
+    started = time.monotonic()
+    state = load_driver_state()
+    # Sin detección (ej: offline/permiso), reusar la última versión conocida
+    chrome_version = detect_chrome_version() or state.get("chrome_version")
+
+    modes = choose_modes(state)
+    preferred = DRIVER_MODES[0]
+    preferred_failed = False
+
+    cached_path = get_cached_driver_path(chrome_version) if chrome_version else None
+    last_error = None
+
+    for mode in modes:
+        use_cache = bool(cached_path and os.path.exists(cached_path))
+        kwargs = {
+            "options": build_options(mode),
+            "version_main": chrome_version,
+            "use_subprocess": True,
+        }
+        if use_cache:
+            kwargs["driver_executable_path"] = cached_path
+
+        try:
+            driver = uc.Chrome(**kwargs)
+        except Exception as e:
+            last_error = e
+            preferred_failed = preferred_failed or mode == preferred
+            logger.warning(f"⚠️ Error iniciando Chrome en modo '{mode}', intentando siguiente: {e}")
+            if use_cache:
+                try:
+                    os.remove(cached_path)
+                except OSError:
+                    pass
+            continue
+
+        # Sin esto un renderer colgado deja driver.get() esperando para siempre
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
+
+        if cached_path and not use_cache:
+            cache_driver_binary(driver, cached_path)
+
+        if mode == preferred:
+            failures, fallback_runs = 0, 0
+        elif preferred_failed:
+            failures, fallback_runs = state.get("preferred_failures", 0) + 1, 0
+        else:
+            failures, fallback_runs = state.get("preferred_failures", 0), state.get("fallback_runs", 0) + 1
+        save_driver_state({
+            "mode": mode,
+            "chrome_version": chrome_version,
+            "driver_path": cached_path if cached_path and os.path.exists(cached_path) else None,
+            "preferred_failures": failures,
+            "fallback_runs": fallback_runs,
+            "last_start": datetime.now().isoformat()
+        })
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"⏱️ Chrome {chrome_version or '?'} iniciado en {elapsed:.1f}s "
+            f"(modo {mode}, driver {'en caché' if use_cache else 'parcheado'})"
+        )
+        return driver
+
+    raise last_error
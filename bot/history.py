@@ -0,0 +1,89 @@
+"""
+Lectura en streaming del historial de propuestas (data/history_proposals.json).
+
+El historial es un único array JSON que crece con cada ejecución. Para
+consultas y estadísticas se recorre entrada por entrada con raw_decode sobre
+bloques del archivo, sin cargar ni parsear todo el array en memoria.
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+
+from .config import Config
+
+
+CHUNK_SIZE = 64 * 1024
+SEPARATORS = re.compile(r"[\s,]*")  # Espacios y comas entre entradas
+
+# Estados de una entrada del historial
+STATUS_SENT = "sent"                  # Propuesta enviada
+STATUS_REJECTED = "rejected"          # Score de la IA por debajo del mínimo
+STATUS_DUPLICATE = "duplicate"        # Repost de un proyecto ya analizado
+STATUS_ALREADY_SENT = "already_sent"  # Workana indicó que ya se había ofertado
+STATUS_CLOSED = "closed"              # Sin #bid_button: ya no acepta propuestas
+STATUS_UNKNOWN = "unknown"            # Entradas antiguas sin precio ni estado
+
+
+def iter_history(path=None):
+    """
+    Recorre el historial entrada por entrada.
+
+    Soporta el formato antiguo (URLs sueltas) y el nuevo (dicts).
+
+    Yields:
+        Dicts normalizados: url, timestamp (datetime o None), price, status, score
+    """
+    path = path or Config.HISTORY_FILE
+    if not os.path.exists(path):
+        return
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(CHUNK_SIZE)
+        pos = SEPARATORS.match(buffer).end()
+        if not buffer.startswith('[', pos):
+            raise ValueError(f"{path} no es un array JSON")
+        pos += 1
+        eof = False
+        while True:
+            # Se avanza un índice sobre el bloque: recortarlo en cada entrada
+            # copiaría el resto del buffer una vez por entrada
+            pos = SEPARATORS.match(buffer, pos).end()
+            if buffer.startswith(']', pos):
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Entrada cortada por el borde del bloque: leer más
+                if eof:
+                    raise
+                chunk = f.read(CHUNK_SIZE)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield normalize_entry(item)
+
+
+def normalize_entry(item):
+    """Lleva una entrada (antigua o nueva) al formato normalizado."""
+    if isinstance(item, str):
+        return {"url": item, "timestamp": None, "price": None, "status": STATUS_UNKNOWN, "score": None}
+    timestamp = None
+    if item.get('timestamp'):
+        try:
+            timestamp = datetime.fromisoformat(item['timestamp'])
+        except ValueError:
+            pass
+    status = item.get('status')
+    if not status:
+        # Antes del campo status solo los envíos guardaban precio
+        status = STATUS_SENT if item.get('price') is not None else STATUS_UNKNOWN
+    return {
+        "url": item.get('url'),
+        "timestamp": timestamp,
+        "price": item.get('price'),
+        "status": status,
+        "score": item.get('score')
+    }
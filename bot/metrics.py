@@ -0,0 +1,186 @@
+"""
+Métricas en formato Prometheus para el scheduler.
+
+Contadores, gauges e histogramas en memoria, servidos por un endpoint HTTP
+opcional en localhost (Config.METRICS_PORT, 0 = desactivado). Registrar una
+métrica es un update de dict bajo un lock, así que se puede dejar siempre
+activo. El servidor corre en un hilo daemon y nunca bloquea al bot.
+
+Cuando el bot corre como worker supervisado (bot/watchdog.py) las métricas
+del proceso hijo viajan al scheduler por la cola de eventos.
+
+Uso:
+    metrics.inc("workana_submissions_total", result="sent")
+    metrics.observe("workana_ai_request_seconds", 2.3, provider="openai")
+    with metrics.timed("workana_phase_seconds", phase="scan"):
+        ...
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .config import Config
+from .logger import logger
+
+
+EVENT_METRIC = "metric"  # Evento worker → watchdog: (tipo, nombre, labels, valor)
+
+# Buckets de los histogramas (segundos)
+BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+
+# Nombre → (tipo, descripción)
+METRICS = {
+    "workana_runs_total": ("counter", "Ejecuciones del bot por resultado"),
+    "workana_candidates_scanned_total": ("counter", "Proyectos leídos del listado"),
+    "workana_candidates_filtered_total": ("counter", "Proyectos descartados antes de la IA, por motivo"),
+    "workana_candidates_viable_total": ("counter", "Proyectos que pasaron el filtro"),
+    "workana_ai_requests_total": ("counter", "Llamadas a la IA por proveedor y resultado"),
+    "workana_ai_request_seconds": ("histogram", "Latencia de cada llamada a la IA"),
+    "workana_ai_json_repairs_total": ("counter", "Reparaciones locales de JSON de la IA por tipo"),
+    "workana_ai_requeries_total": ("counter", "Re-consultas a la IA por JSON inválido e irreparable"),
+    "workana_detail_fetches_total": ("counter", "Descripciones completas pedidas (caché, página leída o sin descripción)"),
+    "workana_insight_lookups_total": ("counter", "Consultas al insight de precios por resultado"),
+    "workana_submissions_total": ("counter", "Envíos de propuestas por resultado"),
+    "workana_prefetch_total": ("counter", "Páginas precargadas usadas o descartadas (ya enviada / cerrada)"),
+    "workana_weekly_proposals": ("gauge", "Propuestas enviadas en la semana actual"),
+    "workana_weekly_quota": ("gauge", "Cuota semanal de propuestas"),
+    "workana_chrome_hangs_total": ("counter", "Comandos de Selenium colgados detectados por el watchdog"),
+    "workana_chrome_restarts_total": ("counter", "Reinicios de Chrome hechos por el watchdog"),
+    "workana_phase_seconds": ("histogram", "Duración de cada fase de la ejecución"),
+}
+
+
+class Registry:
+    """Valores de las métricas, por nombre y labels."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}      # (nombre, labels) → valor (counter/gauge)
+        self.histograms = {}  # (nombre, labels) → [conteos por bucket..., suma, total]
+
+    def apply(self, kind, name, labels, value):
+        key = (name, labels)
+        with self.lock:
+            if kind == "inc":
+                self.values[key] = self.values.get(key, 0) + value
+            elif kind == "set":
+                self.values[key] = value
+            elif kind == "observe":
+                hist = self.histograms.get(key)
+                if hist is None:
+                    hist = self.histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+                for i, bound in enumerate(BUCKETS):
+                    if value <= bound:
+                        hist[i] += 1
+                hist[-2] += value
+                hist[-1] += 1
+
+    def render(self):
+        """Texto en formato de exposición de Prometheus."""
+        with self.lock:
+            values = dict(self.values)
+            histograms = {k: list(v) for k, v in self.histograms.items()}
+
+        lines = []
+        for name, (kind, description) in METRICS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                for (metric, labels), hist in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(BUCKETS, hist):
+                        lines.append(f"{name}_bucket{format_labels(labels + (('le', str(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', '+Inf'),))} {hist[-1]}")
+                    lines.append(f"{name}_sum{format_labels(labels)} {hist[-2]:.3f}")
+                    lines.append(f"{name}_count{format_labels(labels)} {hist[-1]}")
+            else:
+                for (metric, labels), value in sorted(values.items()):
+                    if metric == name:
+                        lines.append(f"{name}{format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+REGISTRY = Registry()
+_forward = None  # Cola hacia el scheduler cuando se corre como worker
+
+
+def forward_to(events):
+    """Envía las métricas de este proceso al watchdog en vez de guardarlas localmente."""
+    global _forward
+    _forward = events
+
+
+def record(kind, name, value, labels):
+    labels = tuple(sorted((k, str(v)) for k, v in labels.items()))
+    if _forward is not None:
+        _forward.put((EVENT_METRIC, (kind, name, labels, value)))
+    else:
+        REGISTRY.apply(kind, name, labels, value)
+
+
+def inc(name, value=1, **labels):
+    record("inc", name, value, labels)
+
+
+def set_gauge(name, value, **labels):
+    record("set", name, value, labels)
+
+
+def observe(name, value, **labels):
+    record("observe", name, value, labels)
+
+
+@contextmanager
+def timed(name, **labels):
+    """Mide la duración del bloque en un histograma."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        observe(name, time.monotonic() - started, **labels)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Sin ruido en los logs por cada scrape
+
+
+def start_server(port=None):
+    """
+    Levanta el endpoint /metrics en localhost en un hilo daemon.
+
+    Returns:
+        El servidor, o None si está desactivado o no se pudo abrir el puerto
+    """
+    port = Config.METRICS_PORT if port is None else port
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    except OSError as e:
+        logger.warning(f"⚠️ No se pudo abrir el endpoint de métricas en el puerto {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"📈 Métricas disponibles en http://127.0.0.1:{port}/metrics")
+    return server
@@ -0,0 +1,179 @@
+"""
+Distribución horaria de publicación de proyectos.
+
+Cada escaneo registra cuándo se publicó cada proyecto visto (hora de escaneo
+menos su antigüedad) en un histograma por (día de semana, hora), separando
+los que aún tenían pocas propuestas. El scheduler usa el histograma para
+elegir los horarios que capturan más proyectos frescos y con poca
+competencia por cada ejecución de la cuota semanal.
+"""
+
+import os
+import re
+import json
+import math
+from datetime import datetime, timedelta
+
+from .config import Config
+from .logger import logger
+
+
+# Unidades de antigüedad en el texto de fecha de Workana (ES / EN / PT)
+AGE_UNITS = [
+    (r"min", 1),
+    (r"hora|hour|hr", 60),
+    (r"d[ií]a|day|dia", 1440),
+    (r"semana|week", 10080),
+    (r"mes|month", 43200),
+]
+
+# Histograma sin datos suficientes: se usan los horarios fijos
+MIN_OBSERVATIONS = 150
+
+# Proyectos vistos recordados (para no contar el mismo dos veces)
+SEEN_RETENTION_DAYS = 14
+
+
+def parse_age_minutes(date_text):
+    """
+    Convierte la antigüedad del listado a minutos.
+
+    Ejemplos: "Publicado: hace 2 horas" → 120, "hace un día" → 1440,
+    "Published: 15 minutes ago" → 15, "hace instantes" → 0.
+
+    Returns:
+        int o None si el texto no se pudo interpretar
+    """
+    text = (date_text or "").lower()
+    if not text or text == "n/a":
+        return None
+    if any(word in text for word in ("instante", "segundo", "just now", "ahora", "moment")):
+        return 0
+    if "ayer" in text or "yesterday" in text:
+        return 1440
+
+    match = re.search(r"\b(\d+|una?|an?)\b\s*([a-zíá]+)", text.split(":")[-1])
+    if not match:
+        return None
+    amount = match.group(1)
+    amount = int(amount) if amount.isdigit() else 1
+    for pattern, minutes in AGE_UNITS:
+        if re.match(pattern, match.group(2)):
+            return amount * minutes
+    return None
+
+
+class PostingHistogram:
+    """
+    Histograma de publicaciones por (día de semana, hora).
+
+    Formato (data/posting_histogram.json):
+        {
+            "counts": {"0-9": {"total": 12, "low_bid": 7}, ...},   # "día-hora"
+            "seen": {"https://...": "2024-01-16T10:00:00"},
+            "first_seen": "2024-01-01T09:00:00"
+        }
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.POSTING_HISTOGRAM_FILE
+        self.data = self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                pass
+        return {"counts": {}, "seen": {}, "first_seen": None}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar el histograma de publicaciones: {e}")
+
+    @property
+    def total(self):
+        return sum(c['total'] for c in self.data['counts'].values())
+
+    def record(self, projects, now=None):
+        """
+        Registra la hora de publicación de los proyectos escaneados.
+
+        Args:
+            projects: Lista de Project (url, age_minutes, bids)
+
+        Returns:
+            Cantidad de proyectos nuevos registrados
+        """
+        now = now or datetime.now()
+        seen = self.data['seen']
+        added = 0
+        for p in projects:
+            age = p.age_minutes
+            if age is None or p.url in seen:
+                continue
+            published = now - timedelta(minutes=age)
+            key = f"{published.weekday()}-{published.hour}"
+            bucket = self.data['counts'].setdefault(key, {"total": 0, "low_bid": 0})
+            bucket['total'] += 1
+            if p.bids < Config.LOW_BID_THRESHOLD:
+                bucket['low_bid'] += 1
+            seen[p.url] = now.isoformat()
+            added += 1
+
+        # Olvidar URLs viejas para que el archivo no crezca sin límite
+        cutoff = (now - timedelta(days=SEEN_RETENTION_DAYS)).isoformat()
+        self.data['seen'] = {url: ts for url, ts in seen.items() if ts >= cutoff}
+        if not self.data.get('first_seen'):
+            self.data['first_seen'] = now.isoformat()
+        self.save()
+        return added
+
+    def choose_slots(self, runs_per_week, days, hours, fresh_hours):
+        """
+        Elige los horarios que maximizan candidatos frescos con pocas propuestas.
+
+        Cada ejecución "consume" los proyectos publicados en las fresh_hours
+        previas; se elige con greedy el horario que cubre más publicaciones
+        low-bid aún no cubiertas, hasta completar runs_per_week.
+
+        Args:
+            runs_per_week: Ejecuciones por semana (cuota semanal / propuestas por ejecución)
+            days: Días permitidos (0=Lunes)
+            hours: Horas permitidas (ej: range(8, 22))
+            fresh_hours: Ventana de frescura de cada ejecución
+
+        Returns:
+            Lista ordenada de tuplas (día, hora) o None si no hay datos suficientes
+        """
+        if self.total < MIN_OBSERVATIONS:
+            return None
+
+        # Peso por hora de la semana: low-bid vale completo, el resto un poco
+        weights = [0.0] * 168
+        for key, bucket in self.data['counts'].items():
+            day, hour = map(int, key.split("-"))
+            weights[day * 24 + hour] = bucket['low_bid'] + 0.1 * (bucket['total'] - bucket['low_bid'])
+
+        candidates = [(d, h) for d in days for h in hours]
+        chosen = []
+        for _ in range(min(runs_per_week, len(candidates))):
+            def value(slot):
+                end = slot[0] * 24 + slot[1]
+                return sum(weights[(end - i) % 168] for i in range(1, fresh_hours + 1))
+            best = max((s for s in candidates if s not in chosen), key=value)
+            chosen.append(best)
+            end = best[0] * 24 + best[1]
+            for i in range(1, fresh_hours + 1):
+                weights[(end - i) % 168] = 0.0
+        return sorted(chosen)
+
+
+def runs_per_week():
+    """Ejecuciones necesarias para usar la cuota semanal."""
+    return math.ceil(Config.MAX_PROPOSALS_PER_WEEK / Config.MAX_PROPOSALS_PER_EXECUTION)
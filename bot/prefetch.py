@@ -0,0 +1,175 @@
+"""
+Precarga del próximo candidato en una pestaña secundaria.
+
+Al terminar cada candidato (enviado, rechazado, descartado o con envío
+fallido) la página del próximo candidato aceptado (y su insight, si se va a
+usar) empieza a cargar en otra pestaña. Tras un envío eso ocurre dentro de
+la espera DELAY_BETWEEN_PROPOSALS, que también cubre su evaluación con la IA
+y revisa la página ya cargada:
+- Si ya tiene propuesta nuestra o no tiene #bid_button se descarta (y queda
+  en el historial) antes de que le toque, y se precarga el siguiente.
+- Si sigue disponible, cuando le toca la pestaña ya cargada pasa a ser la
+  principal.
+
+Selenium maneja una pestaña a la vez: la navegación de la secundaria se
+dispara con location.href (no bloquea) y se vuelve enseguida a la principal.
+"""
+
+from .config import Config
+from .logger import logger
+
+
+# Estado de la página precargada del proyecto
+CHECK_SCRIPT = """
+var html = document.documentElement ? document.documentElement.outerHTML.toLowerCase() : '';
+return {
+    ready: document.readyState === 'complete',
+    login: location.href.toLowerCase().indexOf('login') !== -1,
+    already_sent: html.indexOf('ya has enviado') !== -1 || html.indexOf('already sent') !== -1,
+    has_bid: !!document.querySelector('#bid_button')
+};
+"""
+
+STATE_OK = "ok"
+STATE_LOADING = "loading"
+STATE_ALREADY_SENT = "already_sent"
+STATE_CLOSED = "closed"
+STATE_LOGIN = "login"
+
+
+def insight_url_of(url):
+    return url.replace("/job/", "/job/insight/") if "/insight/" not in url else url
+
+
+class Prefetcher:
+    """Una pestaña con la página del próximo candidato y, opcionalmente, otra con su insight."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.main = None
+        self.project = None
+        self.job_tab = None
+        self.insight_tab = None
+
+    def holds(self, url):
+        return self.project is not None and self.project.url == url
+
+    def open_tab(self, url):
+        """Abre una pestaña que empieza a cargar url y vuelve a la principal."""
+        self.driver.switch_to.new_window('tab')
+        handle = self.driver.current_window_handle
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        self.driver.switch_to.window(self.main)
+        return handle
+
+    def close_tab(self, handle):
+        if handle is None or handle not in self.driver.window_handles:
+            return
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+        self.driver.switch_to.window(self.main)
+
+    def start(self, project):
+        """Empieza a precargar el proyecto (descarta la precarga anterior)."""
+        try:
+            self.discard()
+            self.main = self.driver.current_window_handle
+            self.project = project
+            self.job_tab = self.open_tab(project.url.replace("/job/insight/", "/job/"))
+            if project.bids >= Config.MIN_BIDS_FOR_INSIGHT:
+                self.insight_tab = self.open_tab(insight_url_of(project.url))
+            logger.info(f"   🔭 Precargando próximo candidato: {project.title[:40]}...")
+        except Exception as e:
+            logger.warning(f"   ⚠️ No se pudo precargar el próximo candidato: {e}")
+            self.discard()
+
+    def check(self):
+        """
+        Estado de la página precargada.
+
+        Returns:
+            STATE_OK, STATE_LOADING, STATE_ALREADY_SENT, STATE_CLOSED, STATE_LOGIN
+            o None si no hay precarga
+        """
+        if self.job_tab is None:
+            return None
+        try:
+            self.driver.switch_to.window(self.job_tab)
+            state = self.driver.execute_script(CHECK_SCRIPT)
+        except Exception:
+            return None
+        finally:
+            self.driver.switch_to.window(self.main)
+        if state['login']:
+            return STATE_LOGIN
+        if state['already_sent']:
+            return STATE_ALREADY_SENT
+        if not state['ready']:
+            return STATE_LOADING
+        return STATE_OK if state['has_bid'] else STATE_CLOSED
+
+    def use_insight(self, url):
+        """
+        Pasa a la pestaña del insight precargado.
+
+        Returns:
+            True si quedó activa (el llamador debe cerrar con release_insight)
+        """
+        if not self.holds(url) or self.insight_tab is None:
+            return False
+        try:
+            self.driver.switch_to.window(self.insight_tab)
+            return True
+        except Exception:
+            self.insight_tab = None
+            return False
+
+    def release_insight(self):
+        """Cierra la pestaña del insight y vuelve a la principal."""
+        handle, self.insight_tab = self.insight_tab, None
+        try:
+            if self.driver.current_window_handle == handle:
+                self.driver.close()
+            self.driver.switch_to.window(self.main)
+        except Exception:
+            pass
+
+    def take_job(self, url):
+        """
+        Convierte la pestaña precargada en la principal (cierra la anterior).
+
+        Returns:
+            True si la página del proyecto ya está cargada y activa
+        """
+        if not self.holds(url) or self.job_tab is None:
+            return False
+        try:
+            self.close_tab(self.insight_tab)
+            self.driver.switch_to.window(self.main)
+            self.driver.close()  # Pestaña principal anterior
+            self.driver.switch_to.window(self.job_tab)
+            self.main = self.job_tab
+            self.project, self.job_tab, self.insight_tab = None, None, None
+            return True
+        except Exception as e:
+            logger.warning(f"      ⚠️ No se pudo usar la página precargada: {e}")
+            self.recover()
+            return False
+
+    def discard(self):
+        """Cierra las pestañas de la precarga actual."""
+        if self.project is None:
+            return
+        try:
+            self.close_tab(self.job_tab)
+            self.close_tab(self.insight_tab)
+        except Exception:
+            self.recover()
+        self.project, self.job_tab, self.insight_tab = None, None, None
+
+    def recover(self):
+        """Tras un error, vuelve a cualquier pestaña viva y olvida la precarga."""
+        self.project, self.job_tab, self.insight_tab = None, None, None
+        handles = self.driver.window_handles
+        self.main = self.main if self.main in handles else handles[0]
+        self.driver.switch_to.window(self.main)
@@ -0,0 +1,168 @@
+"""
+Mantenimiento del perfil persistente de Chrome (chrome_profile/).
+
+El perfil acumula caché, code cache, service workers e historial en cada
+ejecución. Este módulo lo poda antes de arrancar el driver:
+- Conserva el estado de sesión (cookies, local storage, preferencias)
+- Borra siempre lo que solo crece (historial, crash dumps, métricas)
+- Recorta el resto (cachés) si el perfil supera el tamaño máximo
+"""
+
+import os
+import shutil
+import time
+
+from .config import Config
+from .logger import logger
+
+
+# Estado crítico de sesión: nunca se borra
+KEEP_ENTRIES = {
+    "Local State",          # Contiene la clave para descifrar las cookies
+    "Cookies",
+    "Cookies-journal",
+    "Network",              # Chrome >= 96 guarda aquí las cookies
+    "Local Storage",
+    "Preferences",
+    "Secure Preferences",
+    "Login Data",
+    "Login Data-journal",
+    "Web Data",
+    "Web Data-journal",
+}
+
+# Solo crecen y no aportan nada al bot: se borran en cada mantenimiento
+ALWAYS_PRUNE_ENTRIES = {
+    "History",
+    "History-journal",
+    "Visited Links",
+    "Top Sites",
+    "Top Sites-journal",
+    "Favicons",
+    "Favicons-journal",
+    "Sessions",
+    "Session Storage",
+    "Media History",
+    "Crashpad",
+    "BrowserMetrics",
+}
+
+
+def get_size(path):
+    """Tamaño en bytes de un archivo o carpeta (recursivo)."""
+    if os.path.islink(path):
+        return 0
+    if os.path.isfile(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def remove_entry(path):
+    """Borra un archivo o carpeta del perfil. Devuelve los bytes liberados."""
+    size = get_size(path)
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+    except OSError:
+        return 0
+    return size
+
+
+def is_profile_in_use(profile_dir):
+    """
+    Indica si un Chrome vivo está usando el perfil.
+
+    En Linux, SingletonLock es un symlink "host-PID"; si el PID ya no existe
+    el lock es de un crash anterior y se puede ignorar.
+    """
+    lock = os.path.join(profile_dir, "SingletonLock")
+    if not os.path.lexists(lock):
+        return False
+    try:
+        pid = int(os.readlink(lock).rsplit("-", 1)[-1])
+        os.kill(pid, 0)
+        return True
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def list_profile_entries(profile_dir):
+    """
+    Devuelve las entradas podables del perfil (nivel raíz y Default/).
+
+    Returns:
+        Lista de tuplas (ruta, nombre)
+    """
+    entries = []
+    for folder in (profile_dir, os.path.join(profile_dir, "Default")):
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            if name in KEEP_ENTRIES or name == "Default" or name.startswith("Singleton"):
+                continue
+            entries.append((os.path.join(folder, name), name))
+    return entries
+
+
+def maintain_profile(profile_dir=None, max_mb=None):
+    """
+    Poda el perfil de Chrome antes de iniciar el driver.
+
+    Args:
+        profile_dir: Carpeta del perfil (por defecto Config.CHROME_PROFILE_DIR)
+        max_mb: Tamaño máximo en MB (por defecto Config.CHROME_PROFILE_MAX_MB)
+
+    Returns:
+        Bytes liberados
+    """
+    profile_dir = profile_dir or Config.CHROME_PROFILE_DIR
+    max_bytes = (max_mb if max_mb is not None else Config.CHROME_PROFILE_MAX_MB) * 1024 * 1024
+
+    if not os.path.isdir(profile_dir):
+        return 0
+    if is_profile_in_use(profile_dir):
+        logger.warning("⚠️ Perfil de Chrome en uso, se omite el mantenimiento.")
+        return 0
+
+    started = time.monotonic()
+    entries = list_profile_entries(profile_dir)
+    sizes = {path: get_size(path) for path, _ in entries}
+    size_before = get_size(profile_dir)
+    freed = 0
+
+    # 1. Lo que solo crece: siempre fuera
+    remaining = []
+    for path, name in entries:
+        if name in ALWAYS_PRUNE_ENTRIES:
+            freed += remove_entry(path)
+        else:
+            remaining.append(path)
+
+    # 2. Cachés y demás: recortar de mayor a menor hasta quedar bajo el tope
+    current = size_before - freed
+    if current > max_bytes:
+        for path in sorted(remaining, key=lambda p: sizes[p], reverse=True):
+            if current <= max_bytes:
+                break
+            released = remove_entry(path)
+            freed += released
+            current -= released
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"🧹 Perfil Chrome: {size_before / 1048576:.1f} MB → {(size_before - freed) / 1048576:.1f} MB "
+        f"(tope {max_bytes / 1048576:.0f} MB) en {elapsed:.2f}s"
+    )
+    return freed
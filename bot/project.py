@@ -0,0 +1,148 @@
+"""
+Registro tipado de un proyecto del listado.
+
+Las tarjetas se parsean una sola vez al extraerlas: presupuesto numérico con
+moneda, cantidad de propuestas, rating y antigüedad. El resto del pipeline
+(filtro, IA, dedup, precio, checkpoint) usa los campos ya parseados en vez de
+volver a aplicar regex sobre los textos. Con __slots__ cada registro ocupa
+bastante menos que un dict, lo que se nota en escaneos grandes.
+"""
+
+import re
+from urllib.parse import urlparse
+
+from .posting_stats import parse_age_minutes
+
+
+# Símbolos que Workana usa en lugar del código ISO
+CURRENCY_SYMBOLS = {"US$": "USD", "R$": "BRL", "€": "EUR", "$": "USD"}
+
+
+def project_slug(url):
+    """Slug normalizado del proyecto: "https://www.workana.com/job/Bot-X?ref=y" → "bot-x"."""
+    path = urlparse(url or "").path.rstrip("/")
+    return path.rsplit("/", 1)[-1].lower()
+
+
+def parse_budget(budget_text):
+    """
+    Parsea el presupuesto del listado.
+
+    Los centavos ("12,50", "1.500,00") se descartan antes de quitar los
+    separadores de miles, para que no cuenten como un número aparte.
+
+    >>> parse_budget("USD 1.000 - 3.000")
+    (1000, 3000, 'USD')
+    >>> parse_budget("Menos de USD 50")
+    (50, 50, 'USD')
+    >>> parse_budget("R$ 1.500,00")
+    (1500, 1500, 'BRL')
+    >>> parse_budget("USD 12,50")
+    (12, 12, 'USD')
+    >>> parse_budget("N/A")
+    (None, None, None)
+
+    Returns:
+        Tupla (mínimo, máximo, moneda)
+    """
+    text = budget_text or ""
+    currency = None
+    match = re.search(r"\b([A-Z]{3})\b", text)
+    if match:
+        currency = match.group(1)
+    else:
+        for symbol, code in CURRENCY_SYMBOLS.items():
+            if symbol in text:
+                currency = code
+                break
+
+    text = re.sub(r"(?<=\d)[.,]\d{1,2}\b", "", text)  # Centavos
+    nums = [int(n) for n in re.findall(r"\d+", re.sub(r"(?<=\d)[.,](?=\d{3})", "", text))]
+    if not nums:
+        return None, None, currency
+    return min(nums), max(nums), currency
+
+
+def parse_bids(bids_text):
+    """Cantidad de propuestas: "Propuestas: 12" → 12."""
+    return int(re.sub(r"[^\d]", "", str(bids_text or "")) or 0)
+
+
+def parse_rating(stars_class):
+    """Clase "stars-rating stars-35" → 3.5 (None si el cliente no tiene rating)."""
+    match = re.search(r"stars-(\d+)", stars_class or "")
+    return int(match.group(1)) / 10 if match else None
+
+
+class Project:
+    """
+    Proyecto del listado con sus campos ya parseados.
+
+    Attributes:
+        url, slug, title, description: Identificación y texto
+        budget_text: Presupuesto tal cual se muestra (para el prompt)
+        budget_min, budget_max, currency: Presupuesto numérico
+        bids: Cantidad de propuestas
+        rating: Rating del cliente (0-5) o None
+        age_minutes: Antigüedad al momento del escaneo o None
+    """
+
+    __slots__ = (
+        "url", "slug", "title", "description", "budget_text",
+        "budget_min", "budget_max", "currency", "bids", "rating", "age_minutes"
+    )
+
+    def __init__(self, url, title, description="", budget_text="N/A", budget_min=None,
+                 budget_max=None, currency=None, bids=0, rating=None, age_minutes=None):
+        self.url = url
+        self.slug = project_slug(url)
+        self.title = title or ""
+        self.description = description or ""
+        self.budget_text = budget_text
+        self.budget_min = budget_min
+        self.budget_max = budget_max
+        self.currency = currency
+        self.bids = bids
+        self.rating = rating
+        self.age_minutes = age_minutes
+
+    @classmethod
+    def from_card(cls, data):
+        """Construye el registro desde los textos extraídos de una tarjeta del listado."""
+        budget_min, budget_max, currency = parse_budget(data.get('budget_text'))
+        return cls(
+            url=data['url'],
+            title=data.get('title'),
+            description=data.get('description'),
+            budget_text=data.get('budget_text') or "N/A",
+            budget_min=budget_min,
+            budget_max=budget_max,
+            currency=currency,
+            bids=parse_bids(data.get('bids_count')),
+            rating=parse_rating(data.get('stars_class')),
+            age_minutes=parse_age_minutes(data.get('date_text'))
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverso de to_dict (checkpoint y cola de reintentos)."""
+        return cls(**{k: data.get(k) for k in cls.__slots__ if k != "slug"})
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__ if k != "slug"}
+
+    def with_description(self, description):
+        """Copia del proyecto con otra descripción (la tarjeta original no cambia)."""
+        data = self.to_dict()
+        data['description'] = description
+        return Project.from_dict(data)
+
+    @property
+    def budget_avg(self):
+        """Promedio del rango de presupuesto (None si no se pudo parsear)."""
+        if self.budget_min is None:
+            return None
+        return (self.budget_min + self.budget_max) // 2
+
+    def __repr__(self):
+        return f"Project({self.slug!r}, bids={self.bids}, budget={self.budget_min}-{self.budget_max} {self.currency})"
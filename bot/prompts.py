@@ -0,0 +1,192 @@
+"""
+Construcción de prompts para la IA con presupuesto de tokens.
+
+- La parte estática (instrucciones) va primero y es idéntica byte a byte en
+  cada llamada. Los servidores locales que reusan el prefijo común entre
+  peticiones (llama.cpp) ya lo aprovechan. El caché de OpenAI, en cambio,
+  solo aplica desde 1024 tokens de prefijo común, y las instrucciones
+  actuales (con el ejemplo de JSON incluido) rondan los 600: con OpenAI
+  cached_tokens queda en 0 hasta que el bloque estático supere ese umbral.
+- Los datos del proyecto van al final; la descripción se compacta y, si
+  supera el presupuesto, se recorta conservando las instrucciones "trampa"
+  del cliente (ej: "Escribe 'hola' al empezar").
+"""
+
+import re
+
+from .config import Config
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("o200k_base")
+except Exception:
+    _ENCODING = None
+
+
+STATIC_INSTRUCTIONS = """ACTÚA COMO: Un Ingeniero de Software Senior con 10 años de experiencia.
+TONO: Seco, directo, profesional. CERO entusiasmo artificial.
+OBJETIVO: Identificar si es un proyecto automatizable y ganar la oferta.
+
+CONTEXTO CRÍTICO (NO MENCIONAR AL CLIENTE):
+- Eres experto en TODO, especialmente en este trabajo específico.
+- Usas las últimas IAs de generación de código (Claude, GPT-4, Cursor, etc.) que son una locura.
+- Esto te permite ser MUY rápido y eficiente.
+- REGLA: "Factura ahora, aprende después" - Acepta proyectos que puedas resolver con IA.
+- Debes ser AGRESIVO en precio y tiempo, pero realista (no imposible).
+
+INSTRUCCIONES CRÍTICAS (ANTI-BOT):
+1. **DETECTOR DE TRAMPAS:** Busca en la descripción si el cliente pide escribir una palabra específica al inicio (ej: "Escribe 'hola' al empezar"). Si existe, LA PRIMERA PALABRA DE TU PROPUESTA DEBE SER ESA.
+2. **PERSONALIZACIÓN:** Menciona un detalle técnico específico de la descripción para demostrar que leíste.
+3. **SCORE DE VIABILIDAD (0-100):**
+   - 80-100: Tareas de automatización, scripts, scraping, webs simples (Dinero fácil con IA).
+   - 0-40: Tareas creativas subjetivas, hardware, o descripciones sin sentido.
+
+ESTRATEGIA DE VENTA (CAMALEÓN):
+- **JAMÁS menciones IA.** Tu rapidez es por "módulos propios", "experiencia" o "metodología optimizada".
+- Si hay mucha competencia (>20), sé más agresivo en el precio/tiempo.
+- Si hay pocas propuestas (<5), puedes ser más agresivo porque hay menos competencia.
+
+PRECIO Y TIEMPO (AGRESIVOS PERO REALISTAS):
+- Considera que puedes usar IAs para acelerar el desarrollo.
+- El precio debe ser competitivo pero no regalado (30-50% del presupuesto del cliente si hay pocas propuestas).
+- El tiempo debe ser 2-3x más rápido que un desarrollador tradicional (pero no imposible).
+- Ejemplo: Si un proyecto normalmente toma 7 días, ofrécelo en 2-3 días.
+- Ejemplo: Si el presupuesto es $1000, ofrécelo en $400-600 si hay pocas propuestas.
+
+REDACCIÓN (HUMANA):
+- PROHIBIDO usar: "Hola", "Espero que estés bien", "Estoy emocionado", "¡!".
+- Estilo Senior: "Leí tu requerimiento sobre [X]. Puedo resolverlo implementando [Y]."
+- Cierre: "¿Tienes la documentación lista?" o similar.
+
+OUTPUT JSON:
+{
+    "is_relevant": true,
+    "score": (0-100),
+    "reason": "...",
+    "delivery_days": (entero, tiempo agresivo pero realista),
+    "proposal_text": "Texto plano...",
+    "suggested_price": (entero, precio agresivo pero competitivo)
+}
+"""
+
+# Fase de scoring (modelo barato/local): solo viabilidad, sin redactar propuesta
+SCORING_INSTRUCTIONS = """ACTÚA COMO: Un Ingeniero de Software Senior que filtra proyectos freelance.
+OBJETIVO: Decidir si el proyecto es automatizable y rentable de resolver con IAs de generación de código.
+
+SCORE DE VIABILIDAD (0-100):
+- 80-100: Tareas de automatización, scripts, scraping, webs simples (Dinero fácil con IA).
+- 0-40: Tareas creativas subjetivas, hardware, o descripciones sin sentido.
+
+OUTPUT JSON:
+{
+    "is_relevant": true,
+    "score": (0-100),
+    "reason": "..."
+}
+"""
+
+PROJECT_TEMPLATE = """
+DATOS DEL PROYECTO:
+Título: {title}
+Descripción: {description}
+Presupuesto Cliente: {budget_text}
+Competencia: {bids_count} propuestas.
+"""
+
+# Frases donde el cliente pide una palabra/frase concreta (nunca se recortan):
+# un verbo de "escribir/empezar" junto a una palabra entre comillas o "palabra"
+TRAP_VERBS = re.compile(
+    r"\b(escrib|empie[cz]|comien[cz]|inici|pon(?:ga|é|e)?\b|write|start|begin)",
+    re.IGNORECASE
+)
+TRAP_TARGET = re.compile(r"[\"'“”‘’«»]|\bpalabra|\bword", re.IGNORECASE)
+
+TRUNCATION_MARK = " [...]"
+
+
+def count_tokens(text):
+    """Cuenta tokens con tiktoken si está instalado; si no, aproxima (~4 caracteres/token)."""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+
+def is_trap_sentence(sentence):
+    """True si la frase parece pedir una palabra concreta en la propuesta."""
+    return bool(TRAP_VERBS.search(sentence) and TRAP_TARGET.search(sentence))
+
+
+def compact_text(text):
+    """Colapsa espacios y saltos de línea repetidos."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def condense_description(description, max_tokens):
+    """
+    Ajusta la descripción al presupuesto de tokens.
+
+    Conserva el inicio de la descripción y todas las frases con
+    instrucciones trampa, aunque estén al final.
+
+    Returns:
+        Tupla (descripción, fue_recortada)
+    """
+    text = compact_text(description)
+    if count_tokens(text) <= max_tokens:
+        return text, False
+
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    traps = [s for s in sentences if is_trap_sentence(s)]
+    trap_text = " ".join(traps)
+    head_budget = max(max_tokens - count_tokens(trap_text) - count_tokens(TRUNCATION_MARK), 0)
+
+    head = []
+    used = 0
+    for sentence in sentences:
+        if sentence in traps:
+            continue
+        cost = count_tokens(sentence) + 1
+        if used + cost > head_budget:
+            break
+        head.append(sentence)
+        used += cost
+
+    # Si la primera frase ya no entra, recortarla por caracteres
+    if not head and head_budget and sentences[0] not in traps:
+        head.append(sentences[0][:head_budget * 4])
+
+    return " ".join(head) + TRUNCATION_MARK + (" " + trap_text if trap_text else ""), True
+
+
+def build_prompt(static_instructions, project_data, max_description_tokens=None):
+    """
+    Construye un prompt: instrucciones estáticas + datos del proyecto.
+
+    Args:
+        static_instructions: Bloque fijo (STATIC_INSTRUCTIONS o SCORING_INSTRUCTIONS)
+        project_data: Project (title, description, budget_text, bids)
+        max_description_tokens: Presupuesto para la descripción
+            (por defecto Config.AI_DESCRIPTION_MAX_TOKENS)
+
+    Returns:
+        Tupla (prompt, info) donde info tiene prompt_tokens y truncated
+    """
+    budget = max_description_tokens or Config.AI_DESCRIPTION_MAX_TOKENS
+    description, truncated = condense_description(project_data.description, budget)
+    prompt = static_instructions + PROJECT_TEMPLATE.format(
+        title=compact_text(project_data.title),
+        description=description,
+        budget_text=project_data.budget_text,
+        bids_count=project_data.bids
+    )
+    return prompt, {"prompt_tokens": count_tokens(prompt), "truncated": truncated}
+
+
+def build_analysis_prompt(project_data, max_description_tokens=None):
+    """Prompt completo: score + propuesta + precio + tiempo."""
+    return build_prompt(STATIC_INSTRUCTIONS, project_data, max_description_tokens)
+
+
+def build_scoring_prompt(project_data, max_description_tokens=None):
+    """Prompt corto de la fase de scoring (solo score y motivo)."""
+    return build_prompt(SCORING_INSTRUCTIONS, project_data, max_description_tokens)
@@ -0,0 +1,180 @@
+"""
+Estado persistente de una ejecución: checkpoint y cola de reintentos.
+
+- RunCheckpoint: guarda en disco la cola de candidatos, los análisis de la IA
+  y los precios de la ejecución en curso. Si el bot se cae, la siguiente
+  ejecución (si el checkpoint sigue fresco) retoma desde ahí sin volver a
+  escanear ni a llamar a la IA.
+- RetryQueue: envíos que fallaron por un error transitorio (timeout, falta
+  #bid_button, sesión caída) con su análisis y precio, reintentados con
+  backoff. Va separada del historial: no cuentan como procesados.
+"""
+
+import os
+import json
+from datetime import datetime, timedelta
+
+from .config import Config
+from .logger import logger
+from .project import Project
+
+
+def write_json_atomic(path, data, indent=2):
+    """Escribe JSON a un temporal y lo renombra (un crash no deja el archivo a medias)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def read_json(path, default):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Archivo de estado ilegible ({os.path.basename(path)}): {e}")
+    return default
+
+
+class RunCheckpoint:
+    """
+    Checkpoint de la ejecución en curso (data/run_checkpoint.json).
+
+    Formato:
+        {
+            "started_at": "...", "updated_at": "...",
+            "candidates": [ {proyecto}, ... ],
+            "analyses": {url: {análisis de la IA}},
+            "prices": {url: precio},
+            "done": [url, ...]
+        }
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.RUN_CHECKPOINT_FILE
+        self.data = read_json(self.path, {})
+
+    def is_fresh(self):
+        """True si hay un checkpoint con candidatos pendientes y reciente."""
+        if not self.data.get("candidates") or not self.pending():
+            return False
+        try:
+            updated = datetime.fromisoformat(self.data["updated_at"])
+        except (KeyError, ValueError):
+            return False
+        return datetime.now() - updated <= timedelta(minutes=Config.CHECKPOINT_MAX_AGE_MINUTES)
+
+    def start(self, candidates):
+        """Empieza un checkpoint nuevo con la cola de candidatos filtrada."""
+        now = datetime.now().isoformat()
+        self.data = {
+            "started_at": now,
+            "updated_at": now,
+            "candidates": [p.to_dict() for p in candidates],
+            "analyses": {},
+            "prices": {},
+            "done": []
+        }
+        self.save()
+
+    def save(self):
+        self.data["updated_at"] = datetime.now().isoformat()
+        try:
+            write_json_atomic(self.path, self.data)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar el checkpoint: {e}")
+
+    def pending(self):
+        """Candidatos (Project) que aún no se terminaron de procesar."""
+        done = set(self.data.get("done", []))
+        return [Project.from_dict(p) for p in self.data.get("candidates", []) if p['url'] not in done]
+
+    def get_analysis(self, url):
+        return self.data["analyses"].get(url)
+
+    def set_analysis(self, url, analysis):
+        self.data["analyses"][url] = analysis
+        self.save()
+
+    def get_price(self, url):
+        return self.data["prices"].get(url)
+
+    def set_price(self, url, price):
+        self.data["prices"][url] = price
+        self.save()
+
+    def is_done(self, url):
+        return url in self.data.get("done", [])
+
+    def mark_done(self, url):
+        self.data["done"].append(url)
+        self.save()
+
+    def clear(self):
+        """Borra el checkpoint (la cola se completó)."""
+        self.data = {}
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class RetryQueue:
+    """
+    Envíos fallidos por errores transitorios (data/retry_queue.json).
+
+    Cada item: {project, analysis, price, attempts, next_attempt_at, last_error}
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.RETRY_QUEUE_FILE
+        self.items = read_json(self.path, [])
+
+    def save(self):
+        try:
+            write_json_atomic(self.path, self.items)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar la cola de reintentos: {e}")
+
+    def urls(self):
+        return {item['project']['url'] for item in self.items}
+
+    def due(self, now=None):
+        """Items cuyo backoff ya venció."""
+        now = (now or datetime.now()).isoformat()
+        return [item for item in self.items if item['next_attempt_at'] <= now]
+
+    def push(self, project, analysis, price, error, attempts=0):
+        """
+        Encola (o re-encola) un envío fallido con backoff exponencial.
+
+        Returns:
+            True si quedó en cola, False si superó RETRY_MAX_ATTEMPTS
+        """
+        self.remove(project.url)
+        attempts += 1
+        if attempts > Config.RETRY_MAX_ATTEMPTS:
+            logger.warning(f"   🗑️ Reintentos agotados para {project.url} ({error}). Se descarta.")
+            self.save()
+            return False
+        delay = timedelta(minutes=Config.RETRY_BASE_MINUTES * (2 ** (attempts - 1)))
+        next_attempt = datetime.now() + delay
+        self.items.append({
+            "project": project.to_dict(),
+            "analysis": analysis,
+            "price": price,
+            "attempts": attempts,
+            "next_attempt_at": next_attempt.isoformat(),
+            "last_error": error
+        })
+        self.save()
+        logger.info(f"   🔁 Envío en cola de reintentos (intento {attempts}/{Config.RETRY_MAX_ATTEMPTS}, desde {next_attempt:%d/%m %H:%M})")
+        return True
+
+    def remove(self, url):
+        before = len(self.items)
+        self.items = [item for item in self.items if item['project']['url'] != url]
+        if len(self.items) != before:
+            self.save()
@@ -0,0 +1,200 @@
+"""
+Registro central de selectores CSS con estadísticas de aciertos.
+
+Cada elemento lógico (banner de cookies, precio del insight, botón de enviar,
+descripción completa del proyecto)
+tiene una lista de selectores alternativos. En vez de probarlos uno por uno
+(un roundtrip y una excepción por selector), se evalúan todos en una sola
+llamada a execute_script y se registra cuáles coincidieron. Con eso:
+- Las alternativas se reordenan según su tasa de aciertos
+- Se avisa cuando un selector que funcionaba deja de coincidir
+"""
+
+import os
+import json
+
+from .config import Config
+from .logger import logger
+
+
+DEFAULT_SELECTORS = {
+    "cookie_banner": [
+        "button.ot-sdk-button-primary",
+        "button#onetrust-accept-btn-handler",
+        "a.ot-close-icon",
+        "button.cookie-accept",
+    ],
+    "insight_price": [
+        "div.col-sm-3.text-right span",
+        "#appH4",
+        "h4.abig",
+    ],
+    "detail_description": [
+        "div.project-details div.expander",
+        "div.project-details .html-desc",
+        "section.project-description .html-desc",
+        "div.specification",
+        "article .html-desc",
+    ],
+    "submit_button": [
+        "#bidForm > div.row > div.col-md-9 > div.wk-submit-block > input",
+        "#bidForm .wk-submit-block input[type='submit']",
+        "#bidForm input[type='submit']",
+        "#bidForm button[type='submit']",
+    ],
+}
+
+# Misses seguidos tras los que un selector que funcionaba se reporta como roto
+STALE_AFTER_MISSES = 5
+
+# Evalúa todos los selectores de una vez.
+# Devuelve [lista de bool por selector, primer elemento que coincide (en orden) o null]
+PROBE_SCRIPT = """
+    var selectors = arguments[0], opts = arguments[1];
+    var matches = [], first = null;
+    for (var i = 0; i < selectors.length; i++) {
+        var hit = null;
+        try {
+            var nodes = document.querySelectorAll(selectors[i]);
+            for (var j = 0; j < nodes.length && !hit; j++) {
+                var el = nodes[j];
+                if (opts.visible) {
+                    var r = el.getBoundingClientRect();
+                    if (!(r.width > 0 && r.height > 0)) continue;
+                }
+                if (opts.digits && !/\\d/.test(el.textContent)) continue;
+                hit = el;
+            }
+        } catch (e) {}
+        matches.push(!!hit);
+        if (hit && !first) first = hit;
+    }
+    return [matches, first];
+"""
+
+
+class SelectorRegistry:
+    """
+    Selectores alternativos por elemento lógico, con estadísticas persistentes.
+
+    Formato de estadísticas (data/selector_stats.json):
+        {"insight_price": {"#appH4": {"probes": 10, "hits": 7, "misses_in_row": 0}, ...}}
+    """
+
+    def __init__(self, path=None, selectors=None):
+        self.path = path or Config.SELECTOR_STATS_FILE
+        self.selectors = selectors or DEFAULT_SELECTORS
+        self.stats = self.load()
+
+    def load(self):
+        """Carga las estadísticas guardadas."""
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+
+    def save(self):
+        """Guarda las estadísticas en disco."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron guardar estadísticas de selectores: {e}")
+
+    def hit_rate(self, name, selector):
+        """Tasa de aciertos de un selector (None si nunca se probó)."""
+        entry = self.stats.get(name, {}).get(selector)
+        if not entry or not entry['probes']:
+            return None
+        return entry['hits'] / entry['probes']
+
+    def ordered(self, name):
+        """
+        Selectores de un elemento ordenados por tasa de aciertos.
+
+        Los que nunca se probaron mantienen su prioridad original
+        (se tratan como 100% para no quedar enterrados).
+        """
+        candidates = self.selectors[name]
+
+        def key(item):
+            index, selector = item
+            rate = self.hit_rate(name, selector)
+            return (-(1.0 if rate is None else rate), index)
+
+        return [sel for _, sel in sorted(enumerate(candidates), key=key)]
+
+    def record(self, name, selectors, matches):
+        """
+        Actualiza las estadísticas con el resultado de un sondeo.
+
+        Un selector solo suma un "miss seguido" si otra alternativa sí
+        coincidió: si no coincide ninguna, el elemento simplemente no está
+        en la página (ej: banner de cookies ya aceptado).
+        """
+        entries = self.stats.setdefault(name, {})
+        element_present = any(matches)
+        for selector, matched in zip(selectors, matches):
+            entry = entries.setdefault(selector, {"probes": 0, "hits": 0, "misses_in_row": 0})
+            entry['probes'] += 1
+            if matched:
+                entry['hits'] += 1
+                entry['misses_in_row'] = 0
+            elif element_present:
+                entry['misses_in_row'] += 1
+                if entry['hits'] and entry['misses_in_row'] == STALE_AFTER_MISSES:
+                    logger.warning(f"   🧩 Selector '{selector}' ({name}) dejó de coincidir.")
+
+    def probe(self, driver, name, visible=False, digits=False):
+        """
+        Busca un elemento lógico probando todas sus alternativas en una sola llamada.
+
+        Args:
+            driver: WebDriver
+            name: Nombre lógico (clave de DEFAULT_SELECTORS)
+            visible: Solo aceptar elementos con tamaño en pantalla
+            digits: Solo aceptar elementos cuyo texto contenga dígitos
+
+        Returns:
+            Tupla (elemento, selector) o (None, None) si nada coincidió
+        """
+        selectors = self.ordered(name)
+        try:
+            matches, element = driver.execute_script(
+                PROBE_SCRIPT, selectors, {"visible": visible, "digits": digits}
+            )
+        except Exception as e:
+            logger.warning(f"   ⚠️ Error sondeando selectores '{name}': {e}")
+            return None, None
+
+        self.record(name, selectors, matches)
+        if element is None:
+            return None, None
+        return element, selectors[matches.index(True)]
+
+    def stale_selectors(self):
+        """Selectores que funcionaban y llevan STALE_AFTER_MISSES fallos seguidos."""
+        stale = []
+        for name, entries in self.stats.items():
+            for selector, entry in entries.items():
+                if entry['hits'] and entry['misses_in_row'] >= STALE_AFTER_MISSES:
+                    stale.append((name, selector))
+        return stale
+
+    def report(self):
+        """Loguea el resumen de aciertos y los selectores rotos."""
+        for name in self.selectors:
+            entries = self.stats.get(name)
+            if not entries:
+                continue
+            summary = ", ".join(
+                f"{sel[:30]}={self.hit_rate(name, sel):.0%}"
+                for sel in self.ordered(name) if sel in entries
+            )
+            logger.info(f"   🧩 Selectores '{name}': {summary}")
+        for name, selector in self.stale_selectors():
+            logger.warning(f"   🧩 Selector roto en '{name}': {selector}")
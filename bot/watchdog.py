@@ -0,0 +1,272 @@
+"""
+Ejecución supervisada del bot en un proceso hijo.
+
+El navegador corre en un proceso worker que reporta por una cola cada
+comando de Selenium que empieza y termina. El proceso del scheduler hace de
+watchdog:
+- Si un comando no vuelve en COMMAND_TIMEOUT_SECONDS (chromedriver o renderer
+  colgado) corta el worker (SIGTERM primero, para que guarde su estado),
+  mata Chrome y chromedriver, y lo relanza; la ejecución retoma desde el
+  checkpoint (bot/run_state.py).
+- Si la ejecución entera supera RUN_DEADLINE_MINUTES la corta sin relanzar.
+- Si la misma página cuelga dos veces se marca como hecha en el checkpoint
+  para que no se coma los reinicios.
+
+Las estadísticas de cuelgues y reinicios se guardan en data/watchdog_stats.json.
+"""
+
+import os
+import time
+import queue
+import signal
+import multiprocessing
+from datetime import datetime
+
+from . import metrics
+from .config import Config
+from .logger import logger
+from .run_state import RunCheckpoint, read_json, write_json_atomic
+
+
+# Eventos worker → watchdog: (tipo, dato)
+EVENT_BUSY = "busy"        # Empieza un comando (dato: nombre del comando)
+EVENT_IDLE = "idle"        # Terminó el comando
+EVENT_DRIVER = "driver"    # PIDs de Chrome y chromedriver
+EVENT_PROJECT = "project"  # URL del proyecto en proceso
+EVENT_DONE = "done"        # run() terminó
+
+WORKER_GRACE_SECONDS = 10  # Tiempo para que el worker guarde su estado tras SIGTERM
+
+
+def attach_watchdog(driver, events):
+    """
+    Instrumenta el driver para reportar cada comando al watchdog.
+
+    WebDriver.execute es el punto por el que pasa todo comando de Selenium
+    (get, find_element, execute_script, click...), así que alcanza con
+    envolverlo en la instancia.
+    """
+    execute = driver.execute
+
+    def supervised_execute(driver_command, params=None):
+        events.put((EVENT_BUSY, driver_command))
+        try:
+            return execute(driver_command, params)
+        finally:
+            events.put((EVENT_IDLE, None))
+
+    driver.execute = supervised_execute
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    events.put((EVENT_DRIVER, {
+        "browser_pid": getattr(driver, 'browser_pid', None),
+        "service_pid": process.pid if process else None
+    }))
+
+
+def stop_worker(signum, frame):
+    # SIGTERM del watchdog: salir por el finally de run() (guarda índices y stats)
+    raise SystemExit(1)
+
+
+def worker_main(events):
+    """Entrada del proceso worker: crea el bot y ejecuta un ciclo."""
+    from .workana_bot import WorkanaBot
+    metrics.forward_to(events)
+    if os.name != "nt":
+        signal.signal(signal.SIGTERM, stop_worker)
+    try:
+        events.put((EVENT_BUSY, "create_driver"))
+        bot = WorkanaBot(events=events)
+        events.put((EVENT_IDLE, None))
+        bot.run()
+    finally:
+        events.put((EVENT_DONE, None))
+
+
+def kill_pid(pid):
+    """Mata un proceso y sus hijos (con psutil si está instalado)."""
+    if not pid:
+        return
+    try:
+        import psutil
+        try:
+            parent = psutil.Process(pid)
+            for child in parent.children(recursive=True):
+                child.kill()
+            parent.kill()
+        except psutil.NoSuchProcess:
+            pass
+        return
+    except ImportError:
+        pass
+    try:
+        os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+    except OSError:
+        pass
+
+
+class WatchdogStats:
+    """Contadores persistentes de cuelgues y reinicios (data/watchdog_stats.json)."""
+
+    def __init__(self, path=None):
+        self.path = path or Config.WATCHDOG_STATS_FILE
+        self.data = read_json(self.path, {})
+        for key in ("runs", "hangs", "restarts", "deadline_kills", "crashes"):
+            self.data.setdefault(key, 0)
+        self.data.setdefault("hangs_by_command", {})
+
+    def count(self, key):
+        self.data[key] += 1
+
+    def record_hang(self, command, url):
+        self.count("hangs")
+        by_command = self.data["hangs_by_command"]
+        by_command[command] = by_command.get(command, 0) + 1
+        self.data["last_hang"] = {"command": command, "url": url, "at": datetime.now().isoformat()}
+
+    def save(self):
+        try:
+            write_json_atomic(self.path, self.data)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo guardar las estadísticas del watchdog: {e}")
+
+
+class Supervisor:
+    """Lanza el worker y lo vigila hasta que termina, cuelga o vence el plazo."""
+
+    def __init__(self, deadline, command_timeout):
+        self.deadline = deadline
+        self.command_timeout = command_timeout
+        self.context = multiprocessing.get_context("spawn")  # Sin heredar hilos ni el driver del padre
+
+    def start(self):
+        self.events = self.context.Queue()
+        self.process = self.context.Process(target=worker_main, args=(self.events,), daemon=True)
+        self.pids = {}
+        self.busy = None  # (comando, desde)
+        self.url = None
+        self.hang = None  # (comando, url) del último cuelgue
+        self.finished = False
+        self.process.start()
+
+    def handle(self, event):
+        kind, data = event
+        if kind == EVENT_BUSY:
+            self.busy = (data, time.monotonic())
+        elif kind == EVENT_IDLE:
+            self.busy = None
+        elif kind == EVENT_DRIVER:
+            self.pids = data
+        elif kind == EVENT_PROJECT:
+            self.url = data
+        elif kind == EVENT_DONE:
+            self.finished = True
+        elif kind == metrics.EVENT_METRIC:
+            metrics.REGISTRY.apply(*data)
+
+    def drain(self, timeout):
+        try:
+            self.handle(self.events.get(timeout=timeout))
+            while True:
+                self.handle(self.events.get_nowait())
+        except queue.Empty:
+            pass
+
+    def kill(self):
+        """
+        Corta el worker, Chrome y chromedriver.
+
+        Primero SIGTERM al worker, para que run() pase por su finally y guarde
+        índices y estadísticas; si no termina en WORKER_GRACE_SECONDS (p. ej.
+        driver.quit() también colgado) se mata todo.
+        """
+        self.process.terminate()
+        grace_end = time.monotonic() + WORKER_GRACE_SECONDS
+        while self.process.is_alive() and time.monotonic() < grace_end:
+            # Seguir leyendo la cola: el worker no sale con eventos sin entregar
+            self.drain(timeout=0.5)
+        kill_pid(self.pids.get("browser_pid"))
+        kill_pid(self.pids.get("service_pid"))
+        self.process.join(5)
+        if self.process.is_alive():
+            kill_pid(self.process.pid)
+            self.process.join(5)
+
+    def watch(self):
+        """
+        Vigila el worker actual.
+
+        Returns:
+            "done", "crash", "hang" o "deadline"
+        """
+        while True:
+            self.drain(timeout=1)
+            if not self.process.is_alive():
+                self.drain(timeout=0)
+                self.process.join()
+                return "done" if self.finished and self.process.exitcode == 0 else "crash"
+
+            now = time.monotonic()
+            if now >= self.deadline:
+                logger.error(f"⏰ Watchdog: la ejecución superó {Config.RUN_DEADLINE_MINUTES} min. Cortando.")
+                self.kill()
+                return "deadline"
+            if self.busy and now - self.busy[1] > self.command_timeout:
+                logger.error(f"🧊 Watchdog: '{self.busy[0]}' sin respuesta hace {now - self.busy[1]:.0f}s. Matando Chrome.")
+                self.hang = (self.busy[0], self.url)  # Antes de kill(): drenar la cola los cambia
+                self.kill()
+                return "hang"
+
+
+def run_supervised():
+    """
+    Ejecuta un ciclo del bot en un proceso hijo vigilado.
+
+    Returns:
+        Resultado final: "done", "crash", "hang" o "deadline"
+    """
+    stats = WatchdogStats()
+    stats.count("runs")
+    supervisor = Supervisor(
+        deadline=time.monotonic() + Config.RUN_DEADLINE_MINUTES * 60,
+        command_timeout=Config.COMMAND_TIMEOUT_SECONDS
+    )
+    hung_urls = {}
+    restarts = 0
+
+    while True:
+        supervisor.start()
+        outcome = supervisor.watch()
+        if outcome == "crash":
+            stats.count("crashes")
+            logger.error(f"💥 El worker terminó con código {supervisor.process.exitcode}.")
+        elif outcome == "deadline":
+            stats.count("deadline_kills")
+        elif outcome == "hang":
+            command, url = supervisor.hang
+            stats.record_hang(command, url)
+            metrics.inc("workana_chrome_hangs_total")
+            if url:
+                hung_urls[url] = hung_urls.get(url, 0) + 1
+                if hung_urls[url] >= 2:
+                    # Una página que cuelga siempre no debe gastar todos los reinicios
+                    logger.warning(f"   🚫 {url} colgó {hung_urls[url]} veces. Se descarta de esta ejecución.")
+                    checkpoint = RunCheckpoint()
+                    if checkpoint.data:
+                        checkpoint.mark_done(url)
+            if restarts < Config.WATCHDOG_MAX_RESTARTS and time.monotonic() < supervisor.deadline:
+                restarts += 1
+                stats.count("restarts")
+                metrics.inc("workana_chrome_restarts_total")
+                logger.info(f"🔄 Watchdog: reiniciando Chrome ({restarts}/{Config.WATCHDOG_MAX_RESTARTS}), retomando desde el checkpoint...")
+                continue
+        break
+
+    stats.save()
+    logger.info(
+        f"🐕 Watchdog: {outcome} | reinicios en esta ejecución: {restarts} | "
+        f"histórico: {stats.data['hangs']} cuelgues, {stats.data['restarts']} reinicios, "
+        f"{stats.data['deadline_kills']} cortes por plazo"
+    )
+    return outcome
@@ -10,7 +10,6 @@ Este módulo contiene la lógica principal del bot:
 
 import time
 import random
-import pickle
 import os
 import json
 import re
@@ -19,13 +18,73 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import undetected_chromedriver as uc
 
 from .config import Config
 from .ai_assistant import AIAssistant
+from .driver import create_driver
+from .cookie_store import CookieStore
+from .selector_registry import SelectorRegistry
+from .dedup import DedupIndex
+from .posting_stats import PostingHistogram
+from .run_state import RunCheckpoint, RetryQueue
+from .project import Project
+from .detail_cache import DetailCache
+from .watchdog import attach_watchdog, EVENT_PROJECT
+from . import metrics
+from .prefetch import Prefetcher, insight_url_of, STATE_ALREADY_SENT, STATE_CLOSED, STATE_LOADING
+from .history import STATUS_SENT, STATUS_REJECTED, STATUS_DUPLICATE, STATUS_ALREADY_SENT, STATUS_CLOSED, normalize_entry
 from .logger import logger  # Importar logger
 
 
+# Scroll de lectura completo dentro de la página: un solo roundtrip de WebDriver.
+# Args: paso mín/máx (px), pausa mín/máx (ms), duración máxima (ms), callback.
+HUMAN_SCROLL_SCRIPT = """
+    var minStep = arguments[0], maxStep = arguments[1];
+    var minDelay = arguments[2], maxDelay = arguments[3];
+    var maxDuration = arguments[4], done = arguments[arguments.length - 1];
+    var started = performance.now();
+    var total = document.body.scrollHeight, current = 0, steps = 0;
+    function rand(a, b) { return a + Math.random() * (b - a); }
+    function finish() {
+        window.scrollTo(0, 0);
+        setTimeout(function () {
+            done({steps: steps, height: total, elapsed: performance.now() - started});
+        }, rand(minDelay, maxDelay));
+    }
+    function step() {
+        if (current >= total || performance.now() - started > maxDuration) return finish();
+        current += Math.round(rand(minStep, maxStep));
+        window.scrollTo(0, current);
+        steps++;
+        setTimeout(step, rand(minDelay, maxDelay));
+    }
+    step();
+"""
+
+# Escaneo en página de los botones "quitar tarea" del formulario de oferta.
+# Devuelve solo botones visibles, que no son submit, y cuyo ícono, clase,
+# aria-label o title nombra explícitamente cerrar/eliminar (palabra completa:
+# "fa-times" sí, "removable" no). Los botones de solo ícono sin esa marca
+# (agregar tarea, adjuntar, ayuda) no se tocan.
+REMOVABLE_TASKS_SCRIPT = """
+    var form = document.querySelector('#bidForm');
+    if (!form) return [];
+    var hint = /\\b(close|remove|delete|trash|times|eliminar|quitar|borrar)\\b/;
+    var found = [];
+    form.querySelectorAll('section button').forEach(function (btn) {
+        if (btn.type === 'submit' || btn.disabled) return;
+        var rect = btn.getBoundingClientRect();
+        if (!(rect.width > 0 && rect.height > 0)) return;
+        if (window.getComputedStyle(btn).visibility === 'hidden') return;
+        var icon = btn.querySelector('i, svg');
+        var iconClass = icon ? (icon.getAttribute('class') || '') : '';
+        var attrs = [btn.className, btn.getAttribute('aria-label') || '', btn.title || '', iconClass].join(' ').toLowerCase();
+        if (hint.test(attrs)) found.push(btn);
+    });
+    return found;
+"""
+
+
 class WorkanaBot:
     """
     Bot automatizado para buscar y enviar propuestas en Workana.
@@ -38,62 +97,22 @@ class WorkanaBot:
     - Anti-detección avanzado
     """
     
-    def __init__(self):
-        """Inicializa el bot con configuración anti-detección."""
-        logger.info("🤖 Inicializando WorkanaBot...")
-        options = uc.ChromeOptions()
-        
-        # 🛡️ CONFIGURACIÓN ANTI-DETECCIÓN
-        user_data_dir = os.path.join(os.getcwd(), "chrome_profile")
-        options.add_argument(f'--user-data-dir={user_data_dir}')
-        options.add_argument('--profile-directory=Default')
+    def __init__(self, events=None):
+        """
+        Inicializa el bot con configuración anti-detección.
         
-        # Modo headless para VPS (sin interfaz gráfica)
+        Args:
+            events: Cola del watchdog si corre como worker supervisado (opcional)
+        """
+        logger.info("🤖 Inicializando WorkanaBot...")
         if Config.HEADLESS_MODE:
-            options.add_argument('--headless=new')
-            options.add_argument('--disable-gpu')
             logger.info("🖥️ Modo headless activado (VPS)")
-        else:
-            options.add_argument('--start-maximized')
-        
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--lang=es-ES,es')
-        options.add_argument('--accept-lang=es-ES,es;q=0.9')
-        options.add_argument('--window-size=1920,1080')  # Tamaño fijo para headless
-        
-        # Preferencias de usuario
-        prefs = {
-            "credentials_enable_service": False,
-            "profile.password_manager_enabled": False,
-            "profile.default_content_setting_values.notifications": 2
-        }
-        options.add_experimental_option("prefs", prefs)
         
-        # Inicializar Chrome (sin useAutomationExtension que causa error)
-        try:
-            self.driver = uc.Chrome(options=options, version_main=None, use_subprocess=True)
-        except Exception as e:
-            logger.warning(f"⚠️ Error con configuración avanzada, intentando básica: {e}")
-            # Fallback: configuración mínima pero que funcione en VPS
-            options = uc.ChromeOptions()
-            
-            # Mantener headless si estaba activado
-            if Config.HEADLESS_MODE:
-                options.add_argument('--headless=new')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--window-size=1920,1080')
-                logger.info("   🖥️ Fallback en modo headless")
-            else:
-                options.add_argument('--start-maximized')
-            
-            # Opciones críticas para VPS
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            self.driver = uc.Chrome(options=options, version_main=None, use_subprocess=True)
+        # Inicializar Chrome (driver cacheado por versión + último modo exitoso)
+        self.driver = create_driver()
+        self.events = events
+        if events is not None:
+            attach_watchdog(self.driver, events)
         
         # 🎭 INYECTAR SCRIPTS ANTI-DETECCIÓN
         try:
@@ -118,10 +137,22 @@ class WorkanaBot:
         self.wait = WebDriverWait(self.driver, 15)
         self.ai = AIAssistant(
             provider=Config.AI_PROVIDER,
-            gemini_key=Config.GEMINI_API_KEY,
-            openai_key=Config.OPENAI_API_KEY
+            scoring_provider=Config.AI_SCORING_PROVIDER
         )
         self.history = self.load_history()
+        self.cookie_store = CookieStore()
+        self.selectors = SelectorRegistry()
+        self.dedup = DedupIndex()
+        self.posting_stats = PostingHistogram()
+        self.checkpoint = RunCheckpoint()
+        self.retry_queue = RetryQueue()
+        self.prefetcher = Prefetcher(self.driver)
+        self.detail_cache = DetailCache()
+
+    def notify(self, kind, data=None):
+        """Envía un evento al watchdog (no hace nada fuera del modo supervisado)."""
+        if self.events is not None:
+            self.events.put((kind, data))
 
     def load_history(self):
         """
@@ -160,6 +191,8 @@ class WorkanaBot:
     def get_weekly_count(self):
         """
         Cuenta cuántas propuestas se han enviado en la semana actual (Lunes a Domingo).
+        
+        Solo cuentan los envíos: rechazados, reposts y "ya enviada" no gastan cuota.
         """
         count = 0
         now = datetime.now()
@@ -167,30 +200,32 @@ class WorkanaBot:
         current_week_start = now.timestamp() - (now.weekday() * 86400) - (now.hour * 3600) - (now.minute * 60) - now.second
         
         for item in self.history:
-            # Si es formato antiguo (string), no tiene fecha, ignorar para el conteo semanal
-            if isinstance(item, dict) and 'timestamp' in item:
-                try:
-                    ts = datetime.fromisoformat(item['timestamp']).timestamp()
-                    if ts >= current_week_start:
-                        count += 1
-                except:
-                    pass
+            # Formato antiguo (string) sin fecha: normalize_entry lo deja sin timestamp
+            entry = normalize_entry(item)
+            if entry['status'] == STATUS_SENT and entry['timestamp'] and entry['timestamp'].timestamp() >= current_week_start:
+                count += 1
         
         logger.info(f"📊 Propuestas de esta semana: {count}/{Config.MAX_PROPOSALS_PER_WEEK}")
+        metrics.set_gauge("workana_weekly_proposals", count)
+        metrics.set_gauge("workana_weekly_quota", Config.MAX_PROPOSALS_PER_WEEK)
         return count
 
-    def save_to_history(self, project_url, price=None):
+    def save_to_history(self, project_url, price=None, status=STATUS_SENT, score=None):
         """
         Guarda un proyecto en el historial con timestamp.
         
         Args:
             project_url: URL del proyecto a guardar
             price: Precio ofertado (opcional)
+            status: Resultado (sent, rejected, duplicate, already_sent)
+            score: Score de la IA (opcional)
         """
         entry = {
             "url": project_url,
             "timestamp": datetime.now().isoformat(),
-            "price": price
+            "price": price,
+            "status": status,
+            "score": score
         }
         
         self.history.append(entry)
@@ -200,67 +235,71 @@ class WorkanaBot:
         with open(Config.HISTORY_FILE, 'w', encoding='utf-8') as f:
             json.dump(self.history, f, ensure_ascii=False, indent=2)
 
+    def is_logged_in(self):
+        """Verifica en la página actual si hay una sesión iniciada."""
+        try:
+            page_source = self.driver.page_source.lower()
+            current_url = self.driver.current_url.lower()
+            
+            if "login" in current_url:
+                return False
+            if any(indicator in page_source for indicator in ["mi perfil", "dashboard", "propuestas", "mensajes", "notificaciones"]):
+                return True
+            return "iniciar sesión" not in page_source and "login" not in page_source
+        except:
+            return False
+
+    def wait_page_loaded(self, timeout=15):
+        """Espera a que el documento termine de cargar (en vez de un sleep fijo)."""
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+        except:
+            pass
+
+    def save_session(self):
+        """Guarda las cookies actuales para la próxima sesión."""
+        try:
+            data = self.cookie_store.save(self.driver.get_cookies())
+            expires = datetime.fromtimestamp(data['expires_at']).strftime('%Y-%m-%d %H:%M')
+            logger.info(f"✅ Cookies guardadas para próxima sesión (expiran {expires}).")
+        except Exception as e:
+            logger.error(f"⚠️ Error guardando cookies: {e}")
+
     def login(self):
         """
         Maneja el login en Workana.
+        
+        Orden: perfil persistente → cookies guardadas (si no expiraron) → login manual.
+        
+        Returns:
+            True si hay sesión activa al terminar
         """
         logger.info("🔐 Verificando sesión...")
         self.driver.get(Config.BASE_URL)
         time.sleep(random.uniform(3, 5))
         
-        # Verificar si realmente estamos logueados
-        is_logged_in = False
-        try:
-            time.sleep(2)
-            page_source = self.driver.page_source.lower()
-            current_url = self.driver.current_url.lower()
-            
-            if "login" in current_url:
-                is_logged_in = False
-            elif any(indicator in page_source for indicator in ["mi perfil", "dashboard", "propuestas", "mensajes", "notificaciones"]):
-                is_logged_in = True
-            elif "iniciar sesión" not in page_source and "login" not in page_source:
-                is_logged_in = True
-            else:
-                is_logged_in = False
-        except:
-            is_logged_in = False
-        
-        if is_logged_in:
+        if self.is_logged_in():
             logger.info("✅ Sesión activa detectada (perfil persistente).")
-            return
+            return True
         
-        # Intentar cargar cookies
-        if os.path.exists(Config.COOKIES_FILE):
+        # Intentar cookies guardadas (la expiración se chequea sin tocar el navegador)
+        if self.cookie_store.is_expired():
+            if self.cookie_store.cookies:
+                logger.warning("⚠️ Las cookies guardadas ya expiraron. Se omite su carga.")
+        else:
             try:
                 logger.info("🔑 Intentando cargar cookies guardadas...")
-                self.driver.get(Config.BASE_URL)
-                time.sleep(random.uniform(2, 3))
-                
-                with open(Config.COOKIES_FILE, 'rb') as f:
-                    cookies = pickle.load(f)
-                
-                cookies_cargadas = 0
-                for c in cookies:
-                    try:
-                        self.driver.add_cookie(c)
-                        cookies_cargadas += 1
-                    except:
-                        pass
-                
-                logger.info(f"   ✅ {cookies_cargadas}/{len(cookies)} cookies cargadas. Recargando...")
+                injected = self.cookie_store.inject(self.driver)
+                logger.info(f"   ✅ {injected}/{len(self.cookie_store.cookies)} cookies cargadas. Recargando...")
                 self.driver.refresh()
-                time.sleep(random.uniform(4, 6))
-                
-                # Verificar nuevamente
-                page_source = self.driver.page_source.lower()
-                current_url = self.driver.current_url.lower()
+                self.wait_page_loaded()
                 
-                if "login" not in current_url and any(indicator in page_source for indicator in ["mi perfil", "dashboard", "propuestas"]):
+                if self.is_logged_in():
                     logger.info("✅ Login recuperado desde cookies.")
-                    return
-                else:
-                    logger.warning("⚠️ Las cookies no funcionaron o expiraron.")
+                    return True
+                logger.warning("⚠️ Las cookies no funcionaron o expiraron.")
             except Exception as e:
                 logger.error(f"⚠️ Error cargando cookies: {e}")
         
@@ -277,32 +316,37 @@ class WorkanaBot:
         
         # Verificar login
         time.sleep(2)
-        page_source = self.driver.page_source.lower()
-        current_url = self.driver.current_url.lower()
-        if "login" in current_url:
+        if "login" in self.driver.current_url.lower():
             logger.error("❌ ERROR: Parece que no se completó el login.")
-            return
+            return False
         
-        try:
-            os.makedirs(os.path.dirname(Config.COOKIES_FILE), exist_ok=True)
-            with open(Config.COOKIES_FILE, 'wb') as f:
-                pickle.dump(self.driver.get_cookies(), f)
-            logger.info("✅ Cookies guardadas para próxima sesión.")
-        except Exception as e:
-            logger.error(f"⚠️ Error guardando cookies: {e}")
+        self.save_session()
+        return True
 
     def human_scroll(self):
-        """Scrollea suavemente para simular lectura humana."""
+        """
+        Scrollea suavemente para simular lectura humana.
+        
+        Todo el recorrido (pasos de 200-400 px con pausas DELAY_SCROLL y vuelta
+        arriba) corre dentro de la página en un solo execute_async_script, en
+        vez de un scrollTo + sleep por paso.
+        """
         try:
-            total_height = int(self.driver.execute_script("return document.body.scrollHeight"))
-            current = 0
-            while current < total_height:
-                scroll_amount = random.randint(200, 400)
-                current += scroll_amount
-                self.driver.execute_script(f"window.scrollTo(0, {current});")
-                time.sleep(random.uniform(*Config.DELAY_SCROLL))
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(random.uniform(*Config.DELAY_SCROLL))
+            started = time.monotonic()
+            # Terminar antes del script timeout del driver en páginas muy largas
+            max_duration = max(Config.SCRIPT_TIMEOUT - 5, 1) * 1000
+            result = self.driver.execute_async_script(
+                HUMAN_SCROLL_SCRIPT, 200, 400,
+                Config.DELAY_SCROLL[0] * 1000, Config.DELAY_SCROLL[1] * 1000, max_duration
+            )
+            # Costo de un roundtrip = tiempo total - tiempo dentro de la página;
+            # antes eran 2 llamadas extra (altura y vuelta arriba) + una por paso
+            roundtrip = max(time.monotonic() - started - result['elapsed'] / 1000, 0)
+            saved_calls = result['steps'] + 1
+            logger.info(
+                f"      📜 Scroll: {result['steps']} pasos en 1 llamada (antes {saved_calls + 1}), "
+                f"~{saved_calls * roundtrip:.2f}s de roundtrips ahorrados"
+            )
         except:
             pass
     
@@ -341,105 +385,149 @@ class WorkanaBot:
             logger.error(f"⚠️ Error en click humano: {e}")
             raise
 
-    def get_smart_price(self, project_url, client_budget_text, bids_count, ai_suggested_price=None):
-        """Calcula el precio inteligente para la propuesta."""
-        # Parsear presupuesto del cliente (fallback)
-        client_avg = 50000
+    def scan_removable_tasks(self):
+        """Botones "quitar tarea" visibles del formulario (un roundtrip)."""
         try:
-            nums = [int(s) for s in re.findall(r'\d+', client_budget_text.replace('.', ''))]
-            if nums:
-                client_avg = int(sum(nums) / len(nums))
-        except:
-            pass
+            return self.driver.execute_script(REMOVABLE_TASKS_SCRIPT) or []
+        except Exception as e:
+            logger.warning(f"      ⚠️ No se pudo escanear tareas extras: {e}")
+            return []
+
+    def remove_extra_tasks(self):
+        """
+        Quita las tareas extra del formulario de oferta.
+        
+        Se hace click en el primer botón de cada escaneo y se vuelve a escanear:
+        si la lista se re-renderiza al quitar una tarea, los demás WebElements
+        quedarían viejos. El tope de clicks es la cantidad de tareas del primer
+        escaneo (con el doble de intentos para clicks que fallen).
+        
+        Returns:
+            Número de tareas eliminadas
+        """
+        logger.info("      🧹 Limpiando tareas extras...")
+        started = time.monotonic()
+        buttons = self.scan_removable_tasks()
+        limit = len(buttons)
+        removed = 0
+        attempts = 0
+        
+        while buttons and removed < limit and attempts < 2 * limit:
+            attempts += 1
+            try:
+                self.human_click(buttons[0])
+                removed += 1
+                time.sleep(random.uniform(0.5, 1.0))
+            except Exception:
+                pass  # Botón re-renderizado: el próximo escaneo trae uno fresco
+            buttons = self.scan_removable_tasks()
+        
+        if buttons:
+            logger.warning(f"      ⚠️ Quedaron {len(buttons)} tareas extras sin quitar.")
+        logger.info(f"      🧹 {removed} tareas extras eliminadas en {time.monotonic() - started:.1f}s")
+        return removed
+
+    def get_smart_price(self, project, ai_suggested_price=None):
+        """Calcula el precio inteligente para la propuesta."""
+        # Presupuesto del cliente (fallback), ya parseado al extraer la tarjeta
+        client_avg = project.budget_avg or 50000
 
         # Si hay pocas propuestas, usar precio de la IA
-        try:
-            count = int(bids_count)
-            if count < Config.MIN_BIDS_FOR_INSIGHT:
-                if ai_suggested_price:
-                    logger.info(f"      💰 Pocas propuestas ({count}). Usando precio de IA: ${ai_suggested_price}")
-                    return ai_suggested_price
-                else:
-                    logger.info(f"      ⚠️ Pocas propuestas ({count}) pero sin precio de IA. Usando presupuesto cliente: ${client_avg}")
-                    return client_avg
-        except:
-            pass
+        if project.bids < Config.MIN_BIDS_FOR_INSIGHT:
+            if ai_suggested_price:
+                logger.info(f"      💰 Pocas propuestas ({project.bids}). Usando precio de IA: ${ai_suggested_price}")
+                return ai_suggested_price
+            else:
+                logger.info(f"      ⚠️ Pocas propuestas ({project.bids}) pero sin precio de IA. Usando presupuesto cliente: ${client_avg}")
+                return client_avg
 
         # Si hay muchas propuestas, usar insight
+        project_url = project.url
+        prefetched = self.prefetcher.use_insight(project_url)
         try:
-            insight_url = project_url.replace("/job/", "/job/insight/") if "/insight/" not in project_url else project_url
-            logger.info("      🔍 Consultando insight de precios...")
-            self.driver.get(insight_url)
-            time.sleep(random.uniform(3, 5))
+            if prefetched:
+                logger.info("      🔍 Consultando insight de precios (precargado)...")
+            else:
+                logger.info("      🔍 Consultando insight de precios...")
+                self.driver.get(insight_url_of(project_url))
+                time.sleep(random.uniform(3, 5))
             
             self.driver.execute_script("window.scrollTo(0, 300);")
             time.sleep(random.uniform(1, 2))
             
-            selectors = ["div.col-sm-3.text-right span", "#appH4", "h4.abig"]
-            for sel in selectors:
-                try:
-                    elem = self.driver.find_element(By.CSS_SELECTOR, sel)
-                    if any(c.isdigit() for c in elem.text):
-                        raw = int(re.sub(r'[^\d]', '', elem.text))
-                        final_price = int(raw * Config.PRICE_PERCENTAGE)
-                        logger.info(f"      💰 Insight detectado: ${raw} → Oferta: ${final_price} (70%)")
-                        return final_price
-                except:
-                    continue
+            elem, _ = self.selectors.probe(self.driver, "insight_price", digits=True)
+            if elem:
+                raw = int(re.sub(r'[^\d]', '', elem.text))
+                final_price = int(raw * Config.PRICE_PERCENTAGE)
+                logger.info(f"      💰 Insight detectado: ${raw} → Oferta: ${final_price} (70%)")
+                metrics.inc("workana_insight_lookups_total", result="hit")
+                return final_price
+            metrics.inc("workana_insight_lookups_total", result="miss")
         except Exception as e:
             logger.warning(f"      ⚠️ No se pudo obtener insight: {e}")
+            metrics.inc("workana_insight_lookups_total", result="error")
+        finally:
+            if prefetched:
+                self.prefetcher.release_insight()
         
         return client_avg
 
+    def send_failed(self, reason, transient):
+        """Registra el motivo de un envío fallido y devuelve False."""
+        self.send_error = reason
+        self.send_error_transient = transient
+        return False
+
     def fill_and_send_proposal(self, project_url, price, days, text):
-        """Llena y envía una propuesta en Workana."""
+        """
+        Llena y envía una propuesta en Workana.
+        
+        Returns:
+            True si se envió. Si falla, self.send_error y
+            self.send_error_transient indican el motivo y si vale reintentar.
+        """
+        self.send_error, self.send_error_transient = None, False
+        submit_clicked = False
         try:
             clean_url = project_url.replace("/job/insight/", "/job/")
             logger.info(f"   🚀 Yendo a ofertar: {clean_url}")
             
-            self.driver.get(clean_url)
-            time.sleep(random.uniform(*Config.DELAY_PAGE))
+            if self.prefetcher.take_job(project_url):
+                logger.info("      ⚡ Página ya precargada.")
+                metrics.inc("workana_prefetch_total", result="used")
+            else:
+                self.driver.get(clean_url)
+                time.sleep(random.uniform(*Config.DELAY_PAGE))
             
             if "login" in self.driver.current_url.lower():
                 logger.error("      ❌ Sesión expirada. Reloguea y reinicia el bot.")
-                return False
+                return self.send_failed("sesión expirada", transient=True)
             
             logger.info("      👀 Simulando lectura del proyecto...")
             self.human_scroll()
             time.sleep(random.uniform(*Config.DELAY_PAGE))
             
             # Cookies banner
-            try:
-                cookie_selectors = [
-                    "button.ot-sdk-button-primary",
-                    "button#onetrust-accept-btn-handler",
-                    "a.ot-close-icon",
-                    "button.cookie-accept"
-                ]
-                for selector in cookie_selectors:
-                    try:
-                        cookie_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if cookie_btn.is_displayed():
-                            self.human_click(cookie_btn)
-                            break
-                    except:
-                        continue
-            except:
-                pass
+            cookie_btn, _ = self.selectors.probe(self.driver, "cookie_banner", visible=True)
+            if cookie_btn:
+                try:
+                    self.human_click(cookie_btn)
+                except:
+                    pass
             
             try:
                 bid_btn = self.wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "#bid_button")))
                 if "ya has enviado" in self.driver.page_source.lower() or "already sent" in self.driver.page_source.lower():
                     logger.warning("      ⚠️ Ya enviaste propuesta a este proyecto.")
-                    self.save_to_history(clean_url)
-                    return False
+                    self.save_to_history(clean_url, status=STATUS_ALREADY_SENT)
+                    return self.send_failed("ya enviada", transient=False)
                 
                 logger.info("      🖱️ Haciendo click en 'Ofertar'...")
                 self.human_click(bid_btn)
                 time.sleep(random.uniform(*Config.DELAY_PAGE))
             except Exception as e:
                 logger.error(f"      ❌ No encontré botón 'Ofertar': {e}")
-                return False
+                return self.send_failed("sin #bid_button", transient=True)
                 
             logger.info("      📝 Llenando formulario (simulando escritura humana)...")
             time.sleep(random.uniform(*Config.DELAY_PAGE))
@@ -456,7 +544,7 @@ class WorkanaBot:
                 time.sleep(random.uniform(*Config.DELAY_CLICK))
             except Exception as e:
                 logger.error(f"      ⚠️ Error llenando precio: {e}")
-                return False
+                return self.send_failed("error en precio", transient=True)
             
             # TIEMPO
             try:
@@ -467,7 +555,7 @@ class WorkanaBot:
                 time.sleep(random.uniform(*Config.DELAY_CLICK))
             except Exception as e:
                 logger.error(f"      ⚠️ Error llenando tiempo: {e}")
-                return False
+                return self.send_failed("error en tiempo", transient=True)
             
             # TEXTO
             try:
@@ -478,58 +566,22 @@ class WorkanaBot:
                 time.sleep(random.uniform(1, 2))
             except Exception as e:
                 logger.error(f"      ⚠️ Error llenando texto: {e}")
-                return False
+                return self.send_failed("error en texto", transient=True)
             
             # Extras (Skills, Portfolio, Tasks)
             # ... (código resumido, igual que antes pero sin prints molestos)
             
             # Eliminar tareas extras
-            logger.info("      🧹 Limpiando tareas extras...")
-            # Buscar todos los botones de eliminar tareas (más robusto)
-            # El selector puede variar, así que buscamos por múltiples patrones
-            selectors_to_try = [
-                "#bidForm > div.row > div.col-md-9 > div:nth-child(5) > div > section > div:nth-child(1) > div > button",
-                "#bidForm button[type='button']",  # Botones genéricos
-                "section button",  # Cualquier botón en secciones
-            ]
-            
-            max_tries = 15
-            
-            while max_tries > 0:
-                found_any = False
-                for selector in selectors_to_try:
-                    try:
-                        # Buscar todos los botones que coincidan
-                        buttons = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        for btn in buttons:
-                            try:
-                                # Verificar que el botón sea visible y tenga un ícono de cerrar
-                                if btn.is_displayed():
-                                    btn_html = btn.get_attribute('outerHTML')
-                                    # Si tiene un ícono "x" o "close" o está en una sección de tareas
-                                    if 'i' in btn_html.lower() or btn.find_elements(By.TAG_NAME, 'i'):
-                                        self.human_click(btn)
-                                        time.sleep(random.uniform(0.5, 1.0))
-                                        found_any = True
-                                        break  # Solo uno a la vez
-                            except:
-                                continue
-                        if found_any:
-                            break
-                    except:
-                        continue
-                
-                if not found_any:
-                    break
-                max_tries -= 1
-
+            self.remove_extra_tasks()
 
             # ENVIAR
             logger.info("      ⏸️ Pausa final antes de enviar...")
             time.sleep(random.uniform(*Config.DELAY_PAGE))
 
-            submit_selector = "#bidForm > div.row > div.col-md-9 > div.wk-submit-block > input"
-            submit_btn = self.driver.find_element(By.CSS_SELECTOR, submit_selector)
+            submit_btn, _ = self.selectors.probe(self.driver, "submit_button")
+            if not submit_btn:
+                logger.error("      ❌ No encontré el botón de enviar.")
+                return self.send_failed("sin botón de enviar", transient=True)
             
             logger.info(f"      💵 Oferta: ${price} | ⏱️ {days} Días")
             
@@ -540,6 +592,7 @@ class WorkanaBot:
                 input("      🔴 Presiona ENTER para ENVIAR la propuesta...")
             
             logger.info("      📤 Enviando propuesta...")
+            submit_clicked = True
             self.human_click(submit_btn)
             time.sleep(random.uniform(4, 6))
             
@@ -551,11 +604,336 @@ class WorkanaBot:
                 return True
             else:
                 logger.warning("      ⚠️ Estado incierto. Verifica manualmente.")
-                return False
+                return self.send_failed("estado incierto", transient=False)
 
         except Exception as e:
             logger.error(f"      ❌ Error llenando formulario: {e}")
+            # Si ya se hizo click en enviar, reintentar podría duplicar la oferta
+            return self.send_failed(type(e).__name__, transient=not submit_clicked)
+
+    def scan_projects(self):
+        """
+        Escanea el listado de búsqueda.
+        
+        Returns:
+            Lista de Project, o None si no cargó el listado
+        """
+        logger.info("🔍 Escaneando proyectos...")
+        self.driver.get(Config.SEARCH_URL)
+        time.sleep(random.uniform(3, 5))
+        
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.project-item")))
+        except:
+            logger.error("⚠️ No cargaron los proyectos.")
+            return None
+
+        # Extraer proyectos
+        cards = self.driver.find_elements(By.CSS_SELECTOR, "div.project-item.js-project")
+        candidates_raw = []
+        
+        for card in cards:
+             try:
+                data = self.driver.execute_script("""
+                    var card = arguments[0];
+                    var title_el = card.querySelector('h2.project-title > span > a');
+                    var budget_el = card.querySelector('span.budget') || card.querySelector('span.values');
+                    var bids_el = card.querySelector('span.bids');
+                    var date_el = card.querySelector('span.date');
+                    var desc_el = card.querySelector('div.html-desc');
+                    var stars_el = card.querySelector('span.stars-rating');
+                    return {
+                        title: title_el ? (title_el.getAttribute('title') || title_el.textContent.trim()) : null,
+                        url: title_el ? title_el.href : null,
+                        budget_text: budget_el ? budget_el.textContent.trim() : 'N/A',
+                        bids_count: bids_el ? bids_el.textContent.trim() : '0',
+                        date_text: date_el ? date_el.textContent.trim() : 'N/A',
+                        description: desc_el ? desc_el.textContent.trim() : 'Sin descripción previa',
+                        stars_class: stars_el ? stars_el.className : null
+                    };
+                """, card)
+                if data and data['url']:
+                    candidates_raw.append(Project.from_card(data))
+             except: continue
+
+        metrics.inc("workana_candidates_scanned_total", len(candidates_raw))
+
+        # Registrar horas de publicación para el scheduler adaptativo
+        try:
+            self.posting_stats.record(candidates_raw)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo actualizar el histograma de publicaciones: {e}")
+        
+        return candidates_raw
+
+    def filter_candidates(self, candidates_raw):
+        """Descarta proyectos ya procesados, en cola de reintentos o con clientes tóxicos."""
+        skip_urls = self.get_history_urls() | self.retry_queue.urls()
+        candidates = []
+        for p in candidates_raw:
+            if p.url in skip_urls:
+                logger.info(f"   ⏭️ Saltando proyecto ya procesado: {p.title[:30]}...")
+                metrics.inc("workana_candidates_filtered_total", reason="history")
+                continue
+            
+            # Filtro rating
+            if p.rating is not None and p.rating < 3.5:
+                logger.warning(f"   💀 Cliente tóxico detectado (Rating {p.rating}). Saltando.")
+                metrics.inc("workana_candidates_filtered_total", reason="toxic_client")
+                continue
+            
+            candidates.append(p)
+        metrics.inc("workana_candidates_viable_total", len(candidates))
+        return candidates
+
+    def limits_reached(self, sent_count):
+        """Chequeo de límites en tiempo real (por ejecución y semanal)."""
+        if sent_count >= Config.MAX_PROPOSALS_PER_EXECUTION:
+            logger.info(f"🛑 Límite por ejecución alcanzado ({sent_count}).")
+            return True
+        if self.get_weekly_count() >= Config.MAX_PROPOSALS_PER_WEEK:
+            logger.warning("🛑 Límite semanal alcanzado durante la ejecución.")
+            return True
+        return False
+
+    def send_proposal(self, p, analysis, price, attempts=0):
+        """
+        Envía una propuesta; si falla por un error transitorio la encola para reintento.
+        
+        Returns:
+            True si se envió
+        """
+        with metrics.timed("workana_phase_seconds", phase="send"):
+            success = self.fill_and_send_proposal(
+                p.url, price, analysis['delivery_days'], analysis['proposal_text']
+            )
+        if success:
+            metrics.inc("workana_submissions_total", result="sent")
+            self.retry_queue.remove(p.url)
+        elif self.send_error_transient:
+            metrics.inc("workana_submissions_total", result="transient_error")
+            self.retry_queue.push(p, analysis, price, self.send_error, attempts)
+        else:
+            metrics.inc("workana_submissions_total", result="permanent_error")
+            self.retry_queue.remove(p.url)
+        return success
+
+    def wait_between_proposals(self, candidates=None, index=None):
+        """
+        Pausa entre propuestas.
+        
+        Con candidates, la pausa se aprovecha: se evalúa y precarga el próximo
+        aceptado (el tiempo de IA cuenta como parte de la espera) y se revisa
+        la página precargada; si ya no está disponible se descarta y se precarga
+        el siguiente, todo antes de que le toque el turno.
+        """
+        wait_time = random.randint(*Config.DELAY_BETWEEN_PROPOSALS)
+        logger.info(f"⏳ Esperando {wait_time//60} min para siguiente propuesta...")
+        deadline = time.monotonic() + wait_time
+        if candidates is not None:
+            self.prefetch_next(candidates, index)
+            while self.prefetcher.project and time.monotonic() < deadline:
+                time.sleep(max(0, min(Config.PREFETCH_CHECK_SECONDS, deadline - time.monotonic())))
+                state = self.prefetcher.check()
+                if state == STATE_LOADING:
+                    continue
+                if not self.drop_if_unavailable(self.prefetcher.project, state):
+                    break  # Cargada y disponible: no hace falta seguir revisando
+                self.prefetch_next(candidates, index)
+        time.sleep(max(0, deadline - time.monotonic()))
+
+    def process_retries(self):
+        """
+        Reintenta los envíos fallidos cuyo backoff ya venció.
+        
+        Usa el análisis y precio guardados: sin IA ni escaneo.
+        
+        Returns:
+            Número de propuestas enviadas
+        """
+        due = self.retry_queue.due()
+        if not due:
+            return 0
+        logger.info(f"🔁 {len(due)} envíos pendientes en cola de reintentos.")
+        sent_count = 0
+        for item in due:
+            if self.limits_reached(sent_count):
+                break
+            p = Project.from_dict(item['project'])
+            self.notify(EVENT_PROJECT, p.url)
+            if p.url in self.get_history_urls():
+                self.retry_queue.remove(p.url)
+                continue
+            logger.info(f"🔁 Reintento {item['attempts']}/{Config.RETRY_MAX_ATTEMPTS}: {p.title[:40]}...")
+            if self.send_proposal(p, item['analysis'], item['price'], item['attempts']):
+                sent_count += 1
+                self.wait_between_proposals()
+        return sent_count
+
+    def evaluate_candidate(self, p):
+        """
+        Decide si se oferta a un candidato (análisis del checkpoint, dedup o IA).
+        
+        Los rechazados y reposts quedan en el historial y hechos en el checkpoint.
+        
+        Returns:
+            "accepted", "rejected", "duplicate", "no_response" o "budget"
+        """
+        logger.info(f"🔹 {p.title[:40]}... | 👥 {p.bids} bids")
+        
+        analysis = self.checkpoint.get_analysis(p.url)
+        if analysis:
+            logger.info("   💾 Análisis recuperado del checkpoint.")
+        else:
+            if self.ai.budget_exhausted():
+                return "budget"
+            
+            # Re-publicaciones: reusar la decisión del proyecto original (sin IA ni segunda oferta)
+            duplicate, similarity = self.dedup.find_duplicate(p)
+            if duplicate:
+                logger.info(f"   ♻️ Repost detectado ({similarity:.0%} similar a {duplicate['url']}, decisión previa: {duplicate['decision']}). Saltando.")
+                self.save_to_history(p.url, status=STATUS_DUPLICATE)
+                self.checkpoint.mark_done(p.url)
+                return "duplicate"
+            
+            with metrics.timed("workana_phase_seconds", phase="analyze"):
+                analysis = self.ai.analyze_project(p)
+            if not analysis:
+                logger.warning("   ⚠️ La IA no respondió. Saltando.")
+                self.checkpoint.mark_done(p.url)  # Sin segunda llamada si ya se evaluó por adelantado
+                return "no_response"
+            
+            # Segundo nivel: solo los que quedaron cerca del umbral ven la descripción completa
+            if abs(analysis['score'] - Config.MIN_SCORE_TO_BID) <= Config.ENRICH_SCORE_MARGIN:
+                analysis = self.enrich_analysis(p, analysis)
+            
+            accepted = analysis['score'] >= Config.MIN_SCORE_TO_BID
+            self.dedup.add(p, "accepted" if accepted else "rejected", analysis['score'])
+            self.checkpoint.set_analysis(p.url, analysis)
+            self.save_progress()
+        
+        if analysis['score'] < Config.MIN_SCORE_TO_BID:
+            self.save_to_history(p.url, status=STATUS_REJECTED, score=analysis['score']) # Guardar como rechazado para no volver a ver
+            self.checkpoint.mark_done(p.url)
+            logger.info(f"   ❌ RECHAZADO (Score: {analysis['score']}) | {analysis.get('reason','')}")
+            return "rejected"
+        
+        logger.info(f"   ✅ ACEPTADO (Score: {analysis['score']})")
+        return "accepted"
+
+    def bid_on(self, p):
+        """
+        Oferta a un candidato aceptado (precio del checkpoint o calculado).
+        
+        Returns:
+            True si se envió
+        """
+        analysis = self.checkpoint.get_analysis(p.url)
+        
+        # Si se precargó, descartar sin navegar si ya no está disponible
+        if self.prefetcher.holds(p.url) and self.drop_if_unavailable(p):
             return False
+        
+        final_price = self.checkpoint.get_price(p.url)
+        if final_price is None:
+            with metrics.timed("workana_phase_seconds", phase="price"):
+                final_price = self.get_smart_price(p, analysis.get('suggested_price'))
+            self.checkpoint.set_price(p.url, final_price)
+        
+        success = self.send_proposal(p, analysis, final_price)
+        self.checkpoint.mark_done(p.url)
+        self.save_progress()
+        return success
+
+    def save_progress(self):
+        """
+        Guarda caché de descripciones y estadísticas de selectores a mitad de ejecución.
+        
+        Si el watchdog mata el worker, run() no llega a su finally; el índice
+        de duplicados ya se guarda solo (journal) en cada add().
+        """
+        self.detail_cache.save()
+        self.selectors.save()
+
+    def fetch_full_description(self, p):
+        """
+        Descripción completa desde la página del proyecto (cacheada por slug).
+        
+        Returns:
+            str o None si no se pudo leer
+        """
+        cached = self.detail_cache.get(p.slug)
+        if cached is not None:
+            metrics.inc("workana_detail_fetches_total", result="cache")
+            return cached
+        try:
+            self.driver.get(p.url.replace("/job/insight/", "/job/"))
+            time.sleep(random.uniform(*Config.DELAY_PAGE))
+            elem, _ = self.selectors.probe(self.driver, "detail_description")
+            description = elem.text.strip() if elem else None
+        except Exception as e:
+            logger.warning(f"      ⚠️ No se pudo leer la página del proyecto: {e}")
+            description = None
+        metrics.inc("workana_detail_fetches_total", result="fetched" if description else "miss")
+        if description:
+            self.detail_cache.put(p.slug, description)
+        return description
+
+    def enrich_analysis(self, p, analysis):
+        """
+        Re-analiza con la descripción completa un candidato con score cerca del umbral.
+        
+        Returns:
+            El análisis nuevo, o el original si la tarjeta ya estaba completa o falló
+        """
+        description = self.fetch_full_description(p)
+        # La tarjeta ya traía todo (o casi): no vale otra llamada a la IA
+        if not description or len(description) <= len(p.description) + Config.ENRICH_MIN_EXTRA_CHARS:
+            return analysis
+        logger.info(
+            f"   🔎 Score {analysis['score']} cerca del umbral: re-analizando con la descripción completa "
+            f"({len(p.description)} → {len(description)} caracteres)"
+        )
+        with metrics.timed("workana_phase_seconds", phase="analyze"):
+            enriched = self.ai.analyze_project(p.with_description(description))
+        return enriched or analysis
+
+    def prefetch_next(self, candidates, index):
+        """Evalúa por adelantado los siguientes candidatos y precarga el primer aceptado."""
+        for q in candidates[index + 1:]:
+            if self.checkpoint.is_done(q.url):
+                continue
+            if self.prefetcher.holds(q.url):
+                return
+            verdict = self.evaluate_candidate(q)
+            if verdict == "budget":
+                return
+            if verdict == "accepted":
+                self.prefetcher.start(q)
+                return
+
+    def drop_if_unavailable(self, p, state=None):
+        """
+        Descarta el candidato precargado si ya tiene propuesta o está cerrado.
+        
+        Queda en el historial, así las próximas ejecuciones lo filtran sin IA.
+        
+        Returns:
+            True si se descartó
+        """
+        state = state or self.prefetcher.check()
+        if state == STATE_ALREADY_SENT:
+            logger.warning(f"   ⚠️ Ya enviaste propuesta a {p.title[:40]}... (detectado en precarga). Descartado.")
+            self.save_to_history(p.url, status=STATUS_ALREADY_SENT)
+        elif state == STATE_CLOSED:
+            logger.warning(f"   🚪 {p.title[:40]}... ya no acepta propuestas (sin #bid_button en precarga). Descartado.")
+            self.save_to_history(p.url, status=STATUS_CLOSED)
+        else:
+            return False
+        metrics.inc("workana_prefetch_total", result=state)
+        self.prefetcher.discard()
+        self.checkpoint.mark_done(p.url)
+        return True
 
     def run(self):
         """Ejecuta el ciclo principal del bot."""
@@ -568,108 +946,74 @@ class WorkanaBot:
                 logger.warning(f"🛑 LÍMITE SEMANAL ALCANZADO ({weekly_count}/{Config.MAX_PROPOSALS_PER_WEEK}). Deteniendo ejecución.")
                 return
 
-            self.login()
-            logger.info("🔍 Escaneando proyectos...")
-            self.driver.get(Config.SEARCH_URL)
-            time.sleep(random.uniform(3, 5))
+            with metrics.timed("workana_phase_seconds", phase="login"):
+                logged_in = self.login()
             
-            try:
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.project-item")))
-            except:
-                logger.error("⚠️ No cargaron los proyectos.")
-                return
-
-            # Extraer proyectos
-            cards = self.driver.find_elements(By.CSS_SELECTOR, "div.project-item.js-project")
-            candidates_raw = []
+            # 2. Envíos pendientes de ejecuciones anteriores
+            sent_count = self.process_retries()
             
-            for card in cards:
-                 try:
-                    data = self.driver.execute_script("""
-                        var card = arguments[0];
-                        var title_el = card.querySelector('h2.project-title > span > a');
-                        var budget_el = card.querySelector('span.budget') || card.querySelector('span.values');
-                        var bids_el = card.querySelector('span.bids');
-                        var date_el = card.querySelector('span.date');
-                        var desc_el = card.querySelector('div.html-desc');
-                        var stars_el = card.querySelector('span.stars-rating');
-                        return {
-                            title: title_el ? (title_el.getAttribute('title') || title_el.textContent.trim()) : null,
-                            url: title_el ? title_el.href : null,
-                            budget_text: budget_el ? budget_el.textContent.trim() : 'N/A',
-                            bids_count: bids_el ? bids_el.textContent.trim() : '0',
-                            date_text: date_el ? date_el.textContent.trim() : 'N/A',
-                            description: desc_el ? desc_el.textContent.trim() : 'Sin descripción previa',
-                            stars_class: stars_el ? stars_el.className : null
-                        };
-                    """, card)
-                    if data and data['url']:
-                        candidates_raw.append(data)
-                 except: continue
-
-            # Filtrar
-            history_urls = self.get_history_urls()
-            candidates = []
-            for p in candidates_raw:
-                if p['url'] in history_urls:
-                    logger.info(f"   ⏭️ Saltando proyecto ya procesado: {p['title'][:30]}...")
-                    continue
-                
-                # Filtro rating
-                if p['stars_class']:
-                    match = re.search(r'stars-(\d+)', p['stars_class'])
-                    if match and int(match.group(1)) < 35:
-                        logger.warning(f"   💀 Cliente tóxico detectado (Rating {match.group(1)/10}). Saltando.")
-                        continue
-                
-                p['bids_count'] = re.sub(r'[^\d]', '', p['bids_count']) or '0'
-                candidates.append(p)
+            # 3. Retomar el checkpoint si la ejecución anterior se cortó, o escanear
+            if self.checkpoint.is_fresh():
+                candidates = self.checkpoint.pending()
+                logger.info(f"⏩ Retomando ejecución anterior: {len(candidates)} candidatos pendientes (sin re-escanear).")
+            else:
+                with metrics.timed("workana_phase_seconds", phase="scan"):
+                    candidates_raw = self.scan_projects()
+                if candidates_raw is None:
+                    return
+                candidates = self.filter_candidates(candidates_raw)
+                self.checkpoint.start(candidates)
             
             logger.info(f"🧠 {len(candidates)} Proyectos nuevos viables. Analizando con IA...")
 
-            sent_count = 0
-            for p in candidates:
-                # Chequeo de límites en tiempo real
-                if sent_count >= Config.MAX_PROPOSALS_PER_EXECUTION:
-                    logger.info(f"🛑 Límite por ejecución alcanzado ({sent_count}).")
-                    break
-                
-                if self.get_weekly_count() >= Config.MAX_PROPOSALS_PER_WEEK:
-                    logger.warning("🛑 Límite semanal alcanzado durante la ejecución.")
+            self.ai.start_run()
+            for index, p in enumerate(candidates):
+                if self.limits_reached(sent_count):
                     break
+                if self.checkpoint.is_done(p.url):
+                    continue  # Ya evaluado por adelantado (rechazado o descartado)
 
-                logger.info(f"🔹 {p['title'][:40]}... | 👥 {p['bids_count']} bids")
-                
-                analysis = self.ai.analyze_project(p)
-                if not analysis:
-                    logger.warning("   ⚠️ La IA no respondió. Saltando.")
-                    continue
-                
-                if analysis['score'] < Config.MIN_SCORE_TO_BID:
-                    self.save_to_history(p['url']) # Guardar como rechazado para no volver a ver
-                    logger.info(f"   ❌ RECHAZADO (Score: {analysis['score']}) | {analysis.get('reason','')}")
-                    continue
-                
-                logger.info(f"   ✅ ACEPTADO (Score: {analysis['score']})")
-                
-                ai_price = analysis.get('suggested_price')
-                final_price = self.get_smart_price(p['url'], p['budget_text'], p['bids_count'], ai_price)
-                
-                success = self.fill_and_send_proposal(
-                    p['url'], final_price, analysis['delivery_days'], analysis['proposal_text']
-                )
+                self.notify(EVENT_PROJECT, p.url)
+                verdict = self.evaluate_candidate(p)
+                if verdict == "budget":
+                    # Sin guardar en historial: se reanalizan en la próxima ejecución
+                    logger.warning(f"⏸️ Presupuesto de IA agotado. {len(candidates) - index} candidatos diferidos a la próxima ejecución.")
+                    break
                 
+                success = False
+                if verdict == "accepted":
+                    success = self.bid_on(p)
                 if success:
                     sent_count += 1
-                    wait_time = random.randint(*Config.DELAY_BETWEEN_PROPOSALS)
-                    logger.info(f"⏳ Esperando {wait_time//60} min para siguiente propuesta...")
-                    time.sleep(wait_time)
+                
+                if sent_count >= Config.MAX_PROPOSALS_PER_EXECUTION:
+                    continue  # El límite corta el loop: nada que precargar
+                if success:
+                    # La espera evalúa, precarga y revisa al próximo aceptado
+                    self.wait_between_proposals(candidates, index)
+                elif not self.prefetcher.project:
+                    # Sin espera de por medio (rechazado, descartado, envío fallido):
+                    # el próximo aceptado empieza a cargar ya
+                    self.prefetch_next(candidates, index)
+
+            # Ejecución terminada sin caerse: lo pendiente se re-escanea la próxima vez
+            self.checkpoint.clear()
+
+            # Refrescar cookies guardadas tras una ejecución exitosa
+            if logged_in:
+                self.save_session()
 
         except Exception as e:
             logger.error(f"❌ Error fatal en ejecución: {e}")
             import traceback
             traceback.print_exc()
         finally:
+            self.ai.log_hedge_stats()
+            self.ai.log_json_stats()
+            self.selectors.report()
+            self.selectors.save()
+            self.dedup.save()
+            self.detail_cache.save()
             if hasattr(self, 'driver') and self.driver:
                 logger.info("👋 Cerrando navegador.")
                 self.driver.quit()
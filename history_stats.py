@@ -0,0 +1,163 @@
+"""
+Estadísticas del historial de propuestas.
+
+Lee data/history_proposals.json en streaming (bot/history.py), sin cargar
+todo el archivo, y responde las consultas más comunes.
+
+Uso:
+    python history_stats.py                     # Resumen: hoy, semana, 7/30 días, total
+    python history_stats.py semanas -n 8        # Enviadas, rechazadas y precio medio por semana
+    python history_stats.py precios --dias 30   # Distribución de precios ofertados
+    python history_stats.py csv historial.csv   # Exportar a CSV
+"""
+
+import csv
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+from bot.history import iter_history, STATUS_SENT, STATUS_REJECTED
+
+
+def inicio_semana(fecha):
+    """Lunes 00:00 de la semana de la fecha."""
+    return (fecha - timedelta(days=fecha.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def filtrar(entradas, desde=None, hasta=None):
+    for e in entradas:
+        if desde and (e['timestamp'] is None or e['timestamp'] < desde):
+            continue
+        if hasta and (e['timestamp'] is None or e['timestamp'] >= hasta):
+            continue
+        yield e
+
+
+def tasa_aceptacion(por_estado):
+    evaluadas = por_estado.get(STATUS_SENT, 0) + por_estado.get(STATUS_REJECTED, 0)
+    return por_estado.get(STATUS_SENT, 0) / evaluadas if evaluadas else None
+
+
+def resumen(entradas, ahora):
+    """Conteos por estado en ventanas de tiempo (una sola pasada)."""
+    ventanas = {
+        "Hoy": ahora.replace(hour=0, minute=0, second=0, microsecond=0),
+        "Esta semana": inicio_semana(ahora),
+        "Últimos 7 días": ahora - timedelta(days=7),
+        "Últimos 30 días": ahora - timedelta(days=30),
+        "Total": None,
+    }
+    conteos = {nombre: {} for nombre in ventanas}
+    for e in entradas:
+        for nombre, desde in ventanas.items():
+            if desde is None or (e['timestamp'] and e['timestamp'] >= desde):
+                conteos[nombre][e['status']] = conteos[nombre].get(e['status'], 0) + 1
+
+    print(f"📊 Historial al {ahora:%Y-%m-%d %H:%M}")
+    for nombre, por_estado in conteos.items():
+        total = sum(por_estado.values())
+        tasa = tasa_aceptacion(por_estado)
+        detalle = ", ".join(f"{estado}: {n}" for estado, n in sorted(por_estado.items())) or "sin registros"
+        print(f"   {nombre:<16} {total:>5} registros | {detalle}" + (f" | aceptación {tasa:.0%}" if tasa is not None else ""))
+
+
+def semanas(entradas, ahora, n):
+    """Enviadas, rechazadas y precio medio por semana."""
+    desde = inicio_semana(ahora) - timedelta(weeks=n - 1)
+    filas = {}
+    for e in filtrar(entradas, desde=desde):
+        fila = filas.setdefault(inicio_semana(e['timestamp']), {"enviadas": 0, "rechazadas": 0, "otras": 0, "suma_precio": 0})
+        if e['status'] == STATUS_SENT:
+            fila["enviadas"] += 1
+            fila["suma_precio"] += e['price'] or 0
+        elif e['status'] == STATUS_REJECTED:
+            fila["rechazadas"] += 1
+        else:
+            fila["otras"] += 1
+
+    print(f"{'Semana':<12} {'Enviadas':>9} {'Rechazadas':>11} {'Otras':>6} {'Aceptación':>11} {'Precio medio':>13}")
+    for i in range(n):
+        semana = desde + timedelta(weeks=i)
+        fila = filas.get(semana, {"enviadas": 0, "rechazadas": 0, "otras": 0, "suma_precio": 0})
+        evaluadas = fila["enviadas"] + fila["rechazadas"]
+        tasa = f"{fila['enviadas'] / evaluadas:.0%}" if evaluadas else "-"
+        medio = f"${fila['suma_precio'] / fila['enviadas']:,.0f}" if fila["enviadas"] else "-"
+        print(f"{semana:%Y-%m-%d}   {fila['enviadas']:>9} {fila['rechazadas']:>11} {fila['otras']:>6} {tasa:>11} {medio:>13}")
+
+
+def percentil(ordenados, p):
+    return ordenados[min(len(ordenados) - 1, int(p * len(ordenados)))]
+
+
+def precios(entradas, desde):
+    """Distribución de precios de las propuestas enviadas."""
+    valores = sorted(
+        float(e['price']) for e in filtrar(entradas, desde=desde)
+        if e['status'] == STATUS_SENT and e['price'] is not None
+    )
+    if not valores:
+        print("Sin propuestas enviadas con precio en el período.")
+        return
+    print(f"💰 {len(valores)} propuestas enviadas")
+    print(f"   Mín ${valores[0]:,.0f} | P25 ${percentil(valores, 0.25):,.0f} | Mediana ${percentil(valores, 0.5):,.0f} | "
+          f"P75 ${percentil(valores, 0.75):,.0f} | Máx ${valores[-1]:,.0f} | Media ${sum(valores) / len(valores):,.0f}")
+
+    # Histograma en 8 rangos iguales
+    rangos = 8
+    ancho = (valores[-1] - valores[0]) / rangos or 1
+    conteos = [0] * rangos
+    for v in valores:
+        conteos[min(rangos - 1, int((v - valores[0]) / ancho))] += 1
+    maximo = max(conteos)
+    for i, n in enumerate(conteos):
+        desde_rango = valores[0] + i * ancho
+        print(f"   ${desde_rango:>9,.0f} - ${desde_rango + ancho:>9,.0f} | {'█' * round(30 * n / maximo):<30} {n}")
+
+
+def exportar_csv(entradas, destino):
+    """Exporta el historial (normalizado) a CSV."""
+    salida = sys.stdout if destino == "-" else open(destino, 'w', newline='', encoding='utf-8')
+    try:
+        writer = csv.writer(salida)
+        writer.writerow(["url", "timestamp", "status", "price", "score"])
+        filas = 0
+        for e in entradas:
+            writer.writerow([e['url'], e['timestamp'].isoformat() if e['timestamp'] else "", e['status'], e['price'] if e['price'] is not None else "", e['score'] if e['score'] is not None else ""])
+            filas += 1
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    if destino != "-":
+        print(f"✅ {filas} registros exportados a {destino}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estadísticas del historial de propuestas")
+    parser.add_argument("--archivo", help="Historial a leer (por defecto data/history_proposals.json)")
+    sub = parser.add_subparsers(dest="comando")
+    sub.add_parser("resumen", help="Conteos por estado en ventanas de tiempo")
+    p_semanas = sub.add_parser("semanas", help="Resultados y precio medio por semana")
+    p_semanas.add_argument("-n", type=int, default=8, help="Cantidad de semanas (default 8)")
+    p_precios = sub.add_parser("precios", help="Distribución de precios enviados")
+    p_precios.add_argument("--dias", type=int, help="Solo los últimos N días")
+    p_csv = sub.add_parser("csv", help="Exportar a CSV")
+    p_csv.add_argument("destino", help="Archivo de salida ('-' para stdout)")
+    p_csv.add_argument("--dias", type=int, help="Solo los últimos N días")
+    args = parser.parse_args(argv)
+
+    ahora = datetime.now()
+    entradas = iter_history(args.archivo)
+    if args.comando == "semanas":
+        semanas(entradas, ahora, args.n)
+    elif args.comando == "precios":
+        precios(entradas, ahora - timedelta(days=args.dias) if args.dias else None)
+    elif args.comando == "csv":
+        if args.dias:
+            entradas = filtrar(entradas, desde=ahora - timedelta(days=args.dias))
+        exportar_csv(entradas, args.destino)
+    else:
+        resumen(entradas, ahora)
+
+
+if __name__ == "__main__":
+    main()
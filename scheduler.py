@@ -3,15 +3,26 @@ Programador de ejecuciones del bot.
 
 Ejecuta el bot en horarios estratégicos para maximizar las oportunidades.
 Configurado para 52 propuestas por semana (7-8 por día).
+
+Los horarios se eligen a partir del histograma de publicaciones observadas
+(bot/posting_stats.py); mientras no haya datos suficientes se usan los
+horarios fijos de HORARIOS_ESTRATEGICOS. El scheduler duerme exactamente
+hasta el próximo horario y, al arrancar, recupera una vez el último horario
+perdido si el VPS estuvo caído.
 """
 
-import schedule
+import os
+import json
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from bot import WorkanaBot
+from bot.config import Config
 from bot.logger import logger
+from bot.posting_stats import PostingHistogram, runs_per_week
+from bot.watchdog import run_supervised
+from bot import metrics
 
-# Horarios estratégicos para 52 propuestas/semana
+# Horarios estratégicos para 52 propuestas/semana (fallback sin histograma)
 # 52 propuestas / 5 días = ~10-11 propuestas/día
 # 2 ejecuciones de 5-6 propuestas cada una = perfecto
 # ⚠️ IMPORTANTE: Estos horarios usan la ZONA HORARIA del VPS
@@ -24,51 +35,123 @@ HORARIOS_ESTRATEGICOS = [
 # Días de la semana (0=Lunes, 6=Domingo)
 DIAS_ESTRATEGICOS = [0, 1, 2, 3, 4]  # Lunes a Viernes
 
+NOMBRES_DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
 
 def ejecutar_bot():
     """Ejecuta el bot una vez."""
     logger.info(f"{'='*30}")
     logger.info(f"🚀 Iniciando ejecución programada")
     logger.info(f"{'='*30}")
-    
+
+    resultado = "done"
     try:
-        bot = WorkanaBot()
-        bot.run()
+        if Config.AUTO_MODE:
+            # Navegador en un proceso hijo: un Chrome colgado no congela el scheduler
+            resultado = run_supervised()
+        else:
+            # Las confirmaciones manuales (input) necesitan la consola del scheduler
+            bot = WorkanaBot()
+            bot.run()
     except Exception as e:
+        resultado = "error"
         logger.error(f"❌ Error ejecutando bot: {e}")
         import traceback
         traceback.print_exc()
-    
+
+    metrics.inc("workana_runs_total", result=resultado)
+    guardar_ultima_ejecucion(datetime.now())
     logger.info("✅ Ejecución completada")
 
 
-def configurar_horarios():
-    """Configura los horarios de ejecución."""
-    for hora in HORARIOS_ESTRATEGICOS:
-        # Ejecutar solo en días laborables
-        schedule.every().monday.at(hora).do(ejecutar_bot)
-        schedule.every().tuesday.at(hora).do(ejecutar_bot)
-        schedule.every().wednesday.at(hora).do(ejecutar_bot)
-        schedule.every().thursday.at(hora).do(ejecutar_bot)
-        schedule.every().friday.at(hora).do(ejecutar_bot)
-    
-    # Obtener zona horaria actual (compatible Windows/Linux)
+def cargar_ultima_ejecucion():
+    """Fecha de la última ejecución programada (o None)."""
+    try:
+        with open(Config.SCHEDULER_STATE_FILE, 'r', encoding='utf-8') as f:
+            return datetime.fromisoformat(json.load(f)['last_run'])
+    except:
+        return None
+
+
+def guardar_ultima_ejecucion(fecha):
+    """Guarda la fecha de la última ejecución programada."""
+    try:
+        os.makedirs(os.path.dirname(Config.SCHEDULER_STATE_FILE), exist_ok=True)
+        with open(Config.SCHEDULER_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({"last_run": fecha.isoformat()}, f)
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo guardar el estado del scheduler: {e}")
+
+
+def calcular_horarios():
+    """
+    Calcula los horarios semanales de ejecución.
+
+    Returns:
+        Tupla (lista ordenada de (día, hora, minuto), origen)
+    """
+    slots = PostingHistogram().choose_slots(
+        runs_per_week=runs_per_week(),
+        days=DIAS_ESTRATEGICOS,
+        hours=Config.SCHEDULE_HOURS,
+        fresh_hours=Config.SCHEDULE_FRESH_HOURS
+    )
+    if slots:
+        return [(dia, hora, 0) for dia, hora in slots], "histograma"
+
+    fijos = []
+    for dia in DIAS_ESTRATEGICOS:
+        for hora in HORARIOS_ESTRATEGICOS:
+            h, m = map(int, hora.split(":"))
+            fijos.append((dia, h, m))
+    return sorted(fijos), "fijos"
+
+
+def ocurrencia(slot, referencia, semanas=0):
+    """Fecha del horario en la semana de la referencia (+/- semanas)."""
+    dia, hora, minuto = slot
+    inicio_semana = (referencia - timedelta(days=referencia.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return inicio_semana + timedelta(weeks=semanas, days=dia, hours=hora, minutes=minuto)
+
+
+def proximo_horario(slots, ahora):
+    """Próxima fecha de ejecución estrictamente posterior a ahora."""
+    return min(f for s in slots for semanas in (0, 1) for f in [ocurrencia(s, ahora, semanas)] if f > ahora)
+
+
+def ultimo_horario(slots, ahora):
+    """Fecha del último horario que ya pasó."""
+    return max(f for s in slots for semanas in (-1, 0) for f in [ocurrencia(s, ahora, semanas)] if f <= ahora)
+
+
+def dormir_hasta(fecha):
+    """Duerme exactamente hasta la fecha (corrigiendo si el reloj se desvía)."""
+    while True:
+        restante = (fecha - datetime.now()).total_seconds()
+        if restante <= 0:
+            return
+        time.sleep(restante)
+
+
+def obtener_zona_horaria():
+    """Zona horaria actual (compatible Windows/Linux)."""
     try:
         import subprocess
-        if hasattr(subprocess, 'check_output'):
-            # Intento genérico, fallará silenciosamente en Windows si no existe el comando
-            try:
-                timezone = subprocess.check_output(['timedatectl', 'show', '--property=Timezone', '--value'], stderr=subprocess.DEVNULL).decode().strip()
-            except:
-                timezone = time.tzname[0]
-        else:
-            timezone = time.tzname[0]
+        # Intento genérico, fallará silenciosamente en Windows si no existe el comando
+        try:
+            return subprocess.check_output(['timedatectl', 'show', '--property=Timezone', '--value'], stderr=subprocess.DEVNULL).decode().strip()
+        except:
+            return time.tzname[0]
     except:
-        timezone = "Desconocida"
-    
-    logger.info("📅 Horarios configurados:")
-    for hora in HORARIOS_ESTRATEGICOS:
-        logger.info(f"   - Lunes a Viernes a las {hora} ({timezone})")
+        return "Desconocida"
+
+
+def mostrar_horarios(slots, origen):
+    """Loguea los horarios configurados."""
+    timezone = obtener_zona_horaria()
+    logger.info(f"📅 Horarios configurados ({origen}, {len(slots)} por semana, zona {timezone}):")
+    for dia, hora, minuto in slots:
+        logger.info(f"   - {NOMBRES_DIAS[dia]} a las {hora:02d}:{minuto:02d}")
 
 
 def main():
@@ -76,18 +159,35 @@ def main():
     logger.info("="*60)
     logger.info("🤖 SCHEDULER DEL BOT DE WORKANA - INICIADO")
     logger.info("="*60)
-    logger.info(f"📊 Objetivo: 52 propuestas por semana")
-    logger.info(f"📅 Ejecuciones: 2 veces al día (09:00 y 17:00)")
-    
-    configurar_horarios()
-    
+    logger.info(f"📊 Objetivo: {Config.MAX_PROPOSALS_PER_WEEK} propuestas por semana")
+    metrics.start_server()
+
+    slots, origen = calcular_horarios()
+    mostrar_horarios(slots, origen)
+
+    # Recuperar un horario perdido mientras el VPS estaba caído
+    ahora = datetime.now()
+    perdido = ultimo_horario(slots, ahora)
+    ultima = cargar_ultima_ejecucion()
+    if (ultima is None or ultima < perdido) and ahora - perdido <= timedelta(hours=Config.MISSED_SLOT_GRACE_HOURS):
+        logger.info(f"⏪ Horario perdido ({perdido:%a %H:%M}). Ejecutando ahora una vez.")
+        ejecutar_bot()
+
     logger.info("✅ Scheduler activo. Esperando horarios programados...")
     logger.info("   Logs disponibles en: logs/bot_execution.log")
-    
-    # Loop principal
+
+    # Loop principal: dormir hasta el próximo horario, ejecutar y recalcular
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # Verificar cada minuto
+        siguiente = proximo_horario(slots, datetime.now())
+        logger.info(f"💤 Próxima ejecución: {siguiente:%Y-%m-%d %H:%M}")
+        dormir_hasta(siguiente)
+        ejecutar_bot()
+
+        # El histograma crece con cada escaneo: recalcular horarios
+        nuevos, origen = calcular_horarios()
+        if nuevos != slots:
+            slots = nuevos
+            mostrar_horarios(slots, origen)
 
 
 if __name__ == "__main__":